@@ -1,17 +1,196 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
+import asyncio
+import datetime
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
 from langchain.agents import AgentExecutor
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI  # Updated import
 from langchain_core.output_parsers import JsonOutputParser
 import google.generativeai as genai
-from ..config import Config  # Import the updated config
+from google.generativeai import caching
+from ..config import Config, get_gemini_model  # Import the updated config
+from ..core.jsonutil import dumps, loads
+
+
+# Gemini explicit context caches for system prompts, keyed by model + prompt hash
+_CACHE: Dict[str, caching.CachedContent] = {}
+# Prompts below Gemini's minimum cacheable size are remembered so we only count once
+_UNCACHEABLE: set = set()
+CACHE_MIN_TOKENS = 2048
+CACHE_TTL = datetime.timedelta(minutes=10)
+CACHE_REFRESH_MARGIN = datetime.timedelta(minutes=1)
+
+# Number of Gemini responses remembered per agent, keyed by exact prompt
+RESPONSE_CACHE_SIZE = 128
+# Optional directory persisting those responses across runs (unset disables the disk tier)
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")
+
+# Upper bound on concurrent Gemini requests per agent (stays under API rate limits)
+MAX_PARALLEL_REQUESTS = int(os.getenv("GEMINI_CONCURRENCY", "8"))
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Shared generation configs for direct Gemini calls
+_DEFAULT_GEN_CFG = genai.types.GenerationConfig(
+    temperature=0.2,
+    max_output_tokens=2000,
+    top_p=0.95,
+    top_k=40
+)
+_JSON_GEN_CFG = genai.types.GenerationConfig(
+    temperature=0.2,
+    max_output_tokens=2000,
+    top_p=0.95,
+    top_k=40,
+    response_mime_type="application/json"
+)
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _is_json_payload(span: str) -> bool:
+    """True if span parses as a JSON object or a non-empty array of objects
+    
+    Bracketed prose such as "[3]" or "[Note]" before the payload is not a match.
+    """
+    try:
+        value = loads(span)
+    except ValueError:
+        return False
+    if isinstance(value, list):
+        return bool(value) and all(isinstance(item, dict) for item in value)
+    return isinstance(value, dict)
+
+
+class _JsonSpanScanner:
+    """Incremental bracket scanner that finds the first balanced JSON payload
+    
+    Text can be fed in chunks (e.g. while a response streams in); each character is
+    visited once. Tracks string/escape state so braces inside string values are ignored.
+    Balanced spans that are not a payload (see _is_json_payload) are skipped.
+    """
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.pos = 0
+        self.start = -1
+        self.stack: List[str] = []
+        self.in_string = False
+        self.escaped = False
+        self.failed = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume a chunk; return the JSON span once it closes, else None"""
+        self.parts.append(chunk)
+        offset = self.pos
+        self.pos += len(chunk)
+        if self.failed:
+            return None
+        
+        for i, ch in enumerate(chunk):
+            if self.start == -1:
+                if ch in _CLOSERS:
+                    self.start = offset + i
+                    self.stack.append(_CLOSERS[ch])
+                continue
+            
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in _CLOSERS:
+                self.stack.append(_CLOSERS[ch])
+            elif ch == "}" or ch == "]":
+                if self.stack.pop() != ch:
+                    self.failed = True
+                    return None
+                if not self.stack:
+                    span = "".join(self.parts)[self.start:offset + i + 1]
+                    if _is_json_payload(span):
+                        return span
+                    # Not the payload - keep scanning after it
+                    self.start = -1
+        return None
+    
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return "".join(self.parts)
+
+
+def _find_json_span(text: str) -> Optional[str]:
+    """Return the first JSON object (or array of objects) in text, found in one linear scan
+    
+    Returns None if no balanced value is found.
+    """
+    return _JsonSpanScanner().feed(text)
+
+
+def _identity(value):
+    """Default parse for _cached_gemini_call: the response text unchanged"""
+    return value
+
+
+def _json_default(obj):
+    """Serialize pydantic models and other non-JSON values in agent inputs"""
+    if hasattr(obj, "model_dump"):
+        # Models here have no aliases or custom serializers, so the field dict is what
+        # model_dump() would build; nested models come back through this default
+        return obj.__dict__
+    return str(obj)
+
+
+def serialize_input(input_data: Any) -> str:
+    """Serialize agent input as canonical (sorted-key) JSON for prompts"""
+    if isinstance(input_data, str):
+        return input_data
+    return dumps(input_data, sort_keys=True, default=_json_default)
+
+
+JSON_SUFFIX = "\n\nIMPORTANT: Return ONLY valid JSON. Do not include any other text, explanations, or markdown formatting."
+
+
+class SimpleExecutor:
+    """Minimal executor wrapping a prompt chain when an agent executor can't be built"""
+    
+    def __init__(self, chain):
+        self.chain = chain
+    
+    def invoke(self, inputs):
+        try:
+            result = self.chain.invoke(inputs)
+            return {"output": str(result)}
+        except Exception as e:
+            return {"output": f"Error: {str(e)}"}
+    
+    async def ainvoke(self, inputs):
+        try:
+            result = await self.chain.ainvoke(inputs)
+            return {"output": str(result)}
+        except Exception as e:
+            return {"output": f"Error: {str(e)}"}
 
 
 class BaseAgent(ABC):
     """Base class for all agents in the system - Updated for Gemini"""
     
+    # Optional Gemini response_schema for JSON-mode direct calls (set by subclasses)
+    response_schema: Optional[Dict[str, Any]] = None
+    # JsonOutputParser is stateless, so every agent shares one instance
+    json_parser = JsonOutputParser()
+    
     def __init__(self, name: str, description: str, llm=None):
         self.name = name
         self.description = description
@@ -25,18 +204,25 @@ class BaseAgent(ABC):
         
         self.tools = []
         self.agent_executor: Optional[AgentExecutor] = None
-        self.json_parser = JsonOutputParser()
+        # Compiled JSON-output chains, keyed by system prompt
+        self._json_chains: Dict[str, Any] = {}
+        # Exact-match LRU of Gemini responses keyed by a hash of (system prompt, user prompt)
+        self._response_cache: OrderedDict = OrderedDict()
         
         # For direct Gemini calls when LangChain tools don't work
-        self.direct_gemini_model = None
-        try:
-            self.direct_gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-        except:
-            pass
+        self.model_name = 'gemini-1.5-flash'
         
         self._setup_tools()
         self._setup_agent()
     
+    @property
+    def direct_gemini_model(self):
+        """Shared direct Gemini model (one instance per model name for the process)"""
+        try:
+            return get_gemini_model(self.model_name)
+        except Exception:
+            return None
+    
     @abstractmethod
     def _setup_tools(self):
         """Setup agent-specific tools - to be implemented by subclasses"""
@@ -52,6 +238,25 @@ class BaseAgent(ABC):
         """Get system prompt for the agent"""
         pass
     
+    @functools.cached_property
+    def _json_generation_config(self):
+        """JSON-mode generation config, built once per agent because it carries the agent's schema"""
+        if self.response_schema is None:
+            return _JSON_GEN_CFG
+        return genai.types.GenerationConfig(
+            temperature=0.2,
+            max_output_tokens=2000,
+            top_p=0.95,
+            top_k=40,
+            response_mime_type="application/json",
+            response_schema=self.response_schema
+        )
+    
+    @functools.cached_property
+    def system_prompt(self) -> str:
+        """System prompt computed once per agent from get_system_prompt()"""
+        return self.get_system_prompt()
+    
     def _create_simple_chain(self, system_prompt: str):
         """Create a simple chain for Gemini (since tool calling might not work well)"""
         prompt = ChatPromptTemplate.from_messages([
@@ -61,8 +266,78 @@ class BaseAgent(ABC):
         
         return prompt | self.llm | self.json_parser
     
-    def _call_direct_gemini(self, prompt: str, system_instruction: str = None):
-        """Call Gemini directly without LangChain tools"""
+    def _get_cached_gemini_model(self, system_instruction: str):
+        """Get a Gemini model bound to a cached system prompt, or None if not cacheable"""
+        key = f"{self.model_name}:{hashlib.blake2b(system_instruction.encode()).hexdigest()}"
+        if key in _UNCACHEABLE:
+            return None
+        # A token is at least a few characters, so short prompts can't reach the minimum
+        if len(system_instruction) < CACHE_MIN_TOKENS * 3:
+            _UNCACHEABLE.add(key)
+            return None
+        
+        try:
+            cached = _CACHE.get(key)
+            if cached is not None:
+                # Refresh the TTL if the cache is about to expire
+                now = datetime.datetime.now(datetime.timezone.utc)
+                if cached.expire_time - now < CACHE_REFRESH_MARGIN:
+                    cached.update(ttl=CACHE_TTL)
+            else:
+                # Gemini rejects caches below the minimum token count
+                token_count = self.direct_gemini_model.count_tokens(system_instruction).total_tokens
+                if token_count < CACHE_MIN_TOKENS:
+                    _UNCACHEABLE.add(key)
+                    return None
+                
+                cached = caching.CachedContent.create(
+                    model=f"models/{self.model_name}",
+                    system_instruction=system_instruction,
+                    ttl=CACHE_TTL
+                )
+                _CACHE[key] = cached
+            
+            return genai.GenerativeModel.from_cached_content(cached_content=cached)
+        except Exception as e:
+            print(f"Gemini context cache unavailable, using uncached call: {e}")
+            # Possibly transient: skip caching for this call only and retry next time
+            _CACHE.pop(key, None)
+            return None
+    
+    def _prepare_direct_gemini(self, prompt: str, system_instruction: str = None, json_mode: bool = False,
+                               generation_config=None):
+        """Pick the Gemini model, contents and config for a direct call, using the prompt cache when possible"""
+        # Native structured output for JSON mode: the response text is guaranteed to be JSON
+        if generation_config is None:
+            generation_config = self._json_generation_config if json_mode else _DEFAULT_GEN_CFG
+        
+        cached_model = None
+        if system_instruction:
+            cached_model = self._get_cached_gemini_model(system_instruction)
+        
+        if cached_model:
+            return cached_model, prompt, generation_config
+        elif system_instruction:
+            return self.direct_gemini_model, f"System: {system_instruction}\n\nUser: {prompt}", generation_config
+        return self.direct_gemini_model, prompt, generation_config
+    
+    def _generate_direct_gemini(self, prompt: str, system_instruction: str = None, stream: bool = False,
+                                json_mode: bool = False, generation_config=None):
+        """Send a generate_content request straight to Gemini"""
+        model, contents, generation_config = self._prepare_direct_gemini(
+            prompt, system_instruction, json_mode, generation_config
+        )
+        return model.generate_content(
+            contents,
+            generation_config=generation_config,
+            stream=stream
+        )
+    
+    def _call_direct_gemini(self, prompt: str, system_instruction: str = None, generation_config=None):
+        """Call Gemini directly without LangChain tools
+        
+        generation_config overrides the default, e.g. to request structured output with a response_schema.
+        """
         if not self.direct_gemini_model:
             # Fallback to LangChain
             messages = []
@@ -75,30 +350,200 @@ class BaseAgent(ABC):
         
         # Use direct Gemini API
         try:
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=2000,
-                top_p=0.95,
-                top_k=40
-            )
-            
-            if system_instruction:
-                response = self.direct_gemini_model.generate_content(
-                    f"System: {system_instruction}\n\nUser: {prompt}",
-                    generation_config=generation_config
-                )
-            else:
-                response = self.direct_gemini_model.generate_content(
-                    prompt,
-                    generation_config=generation_config
-                )
-            
+            response = self._generate_direct_gemini(prompt, system_instruction, generation_config=generation_config)
             return response.text
         except Exception as e:
             print(f"Direct Gemini call failed: {e}")
             # Fallback to simple LLM call
             return self.llm.invoke(prompt).content
     
+    async def _acall_direct_gemini(self, prompt: str, system_instruction: str = None, json_mode: bool = False):
+        """Async version of _call_direct_gemini"""
+        if not self.direct_gemini_model:
+            messages = []
+            if system_instruction:
+                messages.append(SystemMessage(content=system_instruction))
+            messages.append(HumanMessage(content=prompt))
+            
+            response = await self.llm.ainvoke(messages)
+            return response.content
+        
+        try:
+            # Preparing may hit the context-cache API (count_tokens, create, update) synchronously
+            model, contents, generation_config = await asyncio.to_thread(
+                self._prepare_direct_gemini, prompt, system_instruction, json_mode
+            )
+            response = await model.generate_content_async(
+                contents,
+                generation_config=generation_config
+            )
+            return response.text
+        except Exception as e:
+            print(f"Direct Gemini call failed: {e}")
+            return (await self.llm.ainvoke(prompt)).content
+    
+    def _fetch_gemini_response(self, prompt: str, system_instruction: str = None) -> str:
+        """Fetch a response on a _cached_gemini_call miss (subclasses may stream instead)"""
+        return self._call_direct_gemini(prompt, system_instruction)
+    
+    def _read_disk_response(self, key: str) -> Optional[str]:
+        """Load a persisted response from RESPONSE_CACHE_DIR, if enabled and present"""
+        if not RESPONSE_CACHE_DIR:
+            return None
+        try:
+            with open(os.path.join(RESPONSE_CACHE_DIR, f"{key}.txt"), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Response cache read failed: {e}")
+            return None
+    
+    def _delete_disk_response(self, key: str):
+        """Remove a persisted response from RESPONSE_CACHE_DIR, if present"""
+        try:
+            os.remove(os.path.join(RESPONSE_CACHE_DIR, f"{key}.txt"))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Response cache delete failed: {e}")
+    
+    def _write_disk_response(self, key: str, response: str):
+        """Persist a response to RESPONSE_CACHE_DIR, if enabled (atomic rename, so readers never see partial files)"""
+        if not RESPONSE_CACHE_DIR:
+            return
+        path = os.path.join(RESPONSE_CACHE_DIR, f"{key}.txt")
+        tmp_path = None
+        try:
+            os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+            # Unique temp file per write, so concurrent threads and processes never share one
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=RESPONSE_CACHE_DIR, prefix=f"{key}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                f.write(response)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Response cache write failed: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _cached_gemini_call(self, user_prompt: str, system_prompt: str, parse: Callable[[str], Any] = None) -> Any:
+        """Direct Gemini call with exact-match response caching (memory, then optional disk)
+        
+        parse turns the response text into the caller's value, which is returned. The text is only
+        cached once parse accepts it (returns non-None without raising), so a truncated or non-JSON
+        reply is never replayed; a persisted entry that fails to parse is dropped and refetched.
+        Without parse the raw text is returned, and any non-empty response is cached.
+        """
+        if parse is None:
+            parse = _identity
+        key = hashlib.blake2b(f"{self.model_name}\0{system_prompt}\0{user_prompt}".encode()).hexdigest()
+        response = self._response_cache.get(key)
+        if response is not None:
+            try:
+                self._response_cache.move_to_end(key)
+            except KeyError:
+                # Evicted by another worker thread in between
+                pass
+            return parse(response)
+        
+        response = self._read_disk_response(key)
+        if response is not None:
+            try:
+                parsed = parse(response)
+            except Exception:
+                parsed = None
+            if parsed is not None:
+                self._remember_response(key, response)
+                return parsed
+            self._delete_disk_response(key)
+        
+        response = self._fetch_gemini_response(user_prompt, system_prompt)
+        parsed = parse(response)
+        if response and parsed is not None:
+            self._write_disk_response(key, response)
+            self._remember_response(key, response)
+        return parsed
+    
+    def _remember_response(self, key: str, response: str):
+        """Store a response in the in-memory LRU, evicting the oldest entry when full"""
+        self._response_cache[key] = response
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def _stream_direct_gemini(self, prompt: str, system_instruction: str = None, json_mode: bool = False):
+        """Yield Gemini response text chunks as they are generated"""
+        if not self.direct_gemini_model:
+            yield self._call_direct_gemini(prompt, system_instruction)
+            return
+        
+        for chunk in self._generate_direct_gemini(prompt, system_instruction, stream=True, json_mode=json_mode):
+            yield chunk.text
+    
+    def _call_direct_gemini_stream(self, user_prompt: str, system_prompt: str) -> str:
+        """Stream a Gemini response and return as soon as its first JSON payload closes
+        
+        Trailing prose after the JSON is never waited for. If no complete payload arrives,
+        the full response text is returned; if the stream fails, the call is retried
+        without streaming.
+        """
+        scanner = _JsonSpanScanner()
+        try:
+            for chunk in self._stream_direct_gemini(user_prompt, system_prompt):
+                span = scanner.feed(chunk or "")
+                if span is not None:
+                    return span
+        except Exception as e:
+            print(f"Streaming Gemini call failed, retrying without streaming: {e}")
+            return self._call_direct_gemini(user_prompt, system_prompt)
+        return scanner.text
+    
+    def _parse_streamed_json(self, chunks) -> Any:
+        """Scan streamed text and return parsed JSON as soon as the payload is complete"""
+        scanner = _JsonSpanScanner()
+        for chunk in chunks:
+            span = scanner.feed(chunk or "")
+            if span is not None:
+                return loads(span)
+        
+        return self._parse_embedded_json(scanner.text)
+    
+    async def _aparse_streamed_json(self, chunks) -> Any:
+        """Async version of _parse_streamed_json for async chunk iterators"""
+        scanner = _JsonSpanScanner()
+        async for chunk in chunks:
+            span = scanner.feed(chunk or "")
+            if span is not None:
+                return loads(span)
+        
+        return self._parse_embedded_json(scanner.text)
+    
+    def _parse_embedded_json(self, text: str) -> Any:
+        """Decode the first complete JSON value embedded in surrounding text"""
+        starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+        if starts:
+            try:
+                # raw_decode stops at the end of the first value - no greedy regex backtracking
+                return _JSON_DECODER.raw_decode(text, min(starts))[0]
+            except json.JSONDecodeError:
+                pass
+        return self.json_parser.parse(text)
+    
+    def _get_json_chain(self, system_prompt: str):
+        """Get the compiled JSON-only prompt | llm chain for a system prompt, building it once"""
+        chain = self._json_chains.get(system_prompt)
+        if chain is None:
+            json_prompt = system_prompt + JSON_SUFFIX
+            
+            prompt = ChatPromptTemplate.from_messages([
+                SystemMessage(content=json_prompt),
+                ("human", "{input}"),
+            ])
+            chain = prompt | self.llm
+            self._json_chains[system_prompt] = chain
+        return chain
+    
     def _create_agent_executor(self, tools: list, system_prompt: str) -> AgentExecutor:
         """Create an agent executor - simplified for Gemini compatibility"""
         try:
@@ -131,36 +576,19 @@ class BaseAgent(ABC):
             print("Using simple chain instead...")
             
             # Create a simple prompt chain instead
-            class SimpleExecutor:
-                def __init__(self, chain):
-                    self.chain = chain
-                
-                def invoke(self, inputs):
-                    try:
-                        result = self.chain.invoke(inputs)
-                        return {"output": str(result)}
-                    except Exception as e:
-                        return {"output": f"Error: {str(e)}"}
-            
-            chain = self._create_simple_chain(system_prompt)
-            return SimpleExecutor(chain)
+            return SimpleExecutor(self._create_simple_chain(system_prompt))
     
     def run_with_json_output(self, input_data: Dict[str, Any], system_prompt: str = None) -> Dict[str, Any]:
         """Run agent and parse JSON output - optimized for Gemini"""
         try:
             if system_prompt is None:
-                system_prompt = self.get_system_prompt()
-            
-            # Create prompt for JSON output
-            json_prompt = system_prompt + "\n\nIMPORTANT: Return ONLY valid JSON. Do not include any other text, explanations, or markdown formatting."
-            
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content=json_prompt),
-                HumanMessage(content=str(input_data)),
-            ])
+                system_prompt = self.system_prompt
             
-            chain = prompt | self.llm | self.json_parser
-            result = chain.invoke({"input": str(input_data)})
+            # Stream tokens and stop as soon as the JSON payload is complete
+            chain = self._get_json_chain(system_prompt)
+            result = self._parse_streamed_json(
+                chunk.content for chunk in chain.stream({"input": serialize_input(input_data)})
+            )
             
             return {
                 "success": True,
@@ -172,22 +600,14 @@ class BaseAgent(ABC):
         except Exception as e:
             print(f"JSON chain failed, trying direct call: {e}")
             
-            # Try direct Gemini call
+            # Try direct Gemini call, streamed so parsing can finish early
             try:
-                direct_result = self._call_direct_gemini(
-                    f"Return valid JSON for: {str(input_data)}",
-                    system_prompt
-                )
-                
-                # Try to extract JSON from response
-                import json
-                import re
-                
-                # Find JSON in text
-                json_match = re.search(r'\{.*\}', direct_result, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group()
-                    parsed = json.loads(json_str)
+                parsed = self._parse_streamed_json(self._stream_direct_gemini(
+                    f"Return valid JSON for: {serialize_input(input_data)}",
+                    system_prompt,
+                    json_mode=True
+                ))
+                if parsed:
                     return {
                         "success": True,
                         "agent": self.name,
@@ -210,7 +630,7 @@ class BaseAgent(ABC):
         try:
             # Try with agent executor if available
             if self.agent_executor:
-                result = self.agent_executor.invoke({"input": str(input_data)})
+                result = self.agent_executor.invoke({"input": serialize_input(input_data)})
                 return {
                     "success": True,
                     "agent": self.name,
@@ -226,8 +646,8 @@ class BaseAgent(ABC):
             # Last resort: direct call
             try:
                 direct_result = self._call_direct_gemini(
-                    str(input_data),
-                    self.get_system_prompt()
+                    serialize_input(input_data),
+                    self.system_prompt
                 )
                 return {
                     "success": True,
@@ -242,4 +662,86 @@ class BaseAgent(ABC):
                     "agent": self.name,
                     "output": None,
                     "error": f"{str(e)}; Fallback also failed: {str(e2)}"
-                }
\ No newline at end of file
+                }
+    
+    async def arun_with_json_output(self, input_data: Dict[str, Any], system_prompt: str = None) -> Dict[str, Any]:
+        """Async version of run_with_json_output so independent agents can run concurrently"""
+        try:
+            if system_prompt is None:
+                system_prompt = self.system_prompt
+            
+            chain = self._get_json_chain(system_prompt)
+            result = await self._aparse_streamed_json(
+                chunk.content async for chunk in chain.astream({"input": serialize_input(input_data)})
+            )
+            
+            return {
+                "success": True,
+                "agent": self.name,
+                "output": result,
+                "error": None
+            }
+            
+        except Exception as e:
+            print(f"JSON chain failed, trying direct call: {e}")
+            
+            try:
+                direct_result = await self._acall_direct_gemini(
+                    f"Return valid JSON for: {serialize_input(input_data)}",
+                    system_prompt,
+                    json_mode=True
+                )
+                parsed = self._parse_streamed_json([direct_result])
+                if parsed:
+                    return {
+                        "success": True,
+                        "agent": self.name,
+                        "output": parsed,
+                        "error": None,
+                        "method": "direct_gemini"
+                    }
+            except:
+                pass
+            
+            return {
+                "success": False,
+                "agent": self.name,
+                "output": None,
+                "error": str(e)
+            }
+    
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of run - use with asyncio.gather to overlap independent agents"""
+        try:
+            if self.agent_executor:
+                result = await self.agent_executor.ainvoke({"input": serialize_input(input_data)})
+                return {
+                    "success": True,
+                    "agent": self.name,
+                    "output": result.get("output", ""),
+                    "intermediate_steps": result.get("intermediate_steps", []),
+                    "error": None
+                }
+            else:
+                return await self.arun_with_json_output(input_data)
+                
+        except Exception as e:
+            try:
+                direct_result = await self._acall_direct_gemini(
+                    serialize_input(input_data),
+                    self.system_prompt
+                )
+                return {
+                    "success": True,
+                    "agent": self.name,
+                    "output": direct_result,
+                    "error": None,
+                    "method": "direct_fallback"
+                }
+            except Exception as e2:
+                return {
+                    "success": False,
+                    "agent": self.name,
+                    "output": None,
+                    "error": f"{str(e)}; Fallback also failed: {str(e2)}"
+                }
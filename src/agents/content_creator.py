@@ -1,14 +1,276 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from langchain.tools import Tool
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
-import json
-import re
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, serialize_input, MAX_PARALLEL_REQUESTS, _CLOSERS, _find_json_span
+from src.core.jsonutil import dumps, loads
 from src.core.models import FAQItem, ProductPage
 
+logger = logging.getLogger(__name__)
+
+
+# Static system prompts sit at module scope so every call sends a byte-identical prefix
+FAQ_SYSTEM_PROMPT = """You are a skincare content expert creating FAQ sections.
+
+Your task: Create detailed, helpful answers for skincare product questions.
+
+Format each FAQ item as:
+{
+  "question": "The original question",
+  "answer": "Detailed, helpful answer (3-5 sentences)",
+  "category": "question category",
+  "tags": ["relevant", "tags"]
+}
+
+Guidelines:
+1. Answers must be based ONLY on provided product data
+2. Keep answers professional and factual
+3. Include key ingredients, benefits, usage instructions
+4. Address safety concerns honestly
+5. Add relevant tags like "ingredients", "safety", "usage", etc.
+
+Return ONLY a JSON array of FAQ items."""
+
+PRODUCT_PAGE_SYSTEM_PROMPT = """You are a professional skincare copywriter creating product pages.
+
+Create a complete, compelling product page with these sections:
+1. Hero Section: Title, tagline, key selling points
+2. Benefits Section: Detailed benefits with scientific backing
+3. Ingredients Section: Key ingredients explained
+4. Usage Section: How to use, frequency, best practices
+5. Safety Section: Side effects, precautions, who should avoid
+6. Pricing Section: Price, value proposition
+7. CTA Section: Call to action buttons/messages
+
+Return ONLY valid JSON in this exact structure:
+{
+  "title": "Product Name",
+  "meta_description": "SEO-friendly description",
+  "hero_section": {
+    "headline": "Main headline",
+    "subheadline": "Supporting text",
+    "key_points": ["Point 1", "Point 2", "Point 3"]
+  },
+  "benefits_section": [
+    {
+      "benefit": "Brightening",
+      "description": "How it brightens",
+      "scientific_basis": "Scientific explanation"
+    }
+  ],
+  "ingredients_section": [
+    {
+      "ingredient": "Vitamin C",
+      "purpose": "Antioxidant protection",
+      "benefits": ["Brightening", "Collagen production"]
+    }
+  ],
+  "usage_section": {
+    "instructions": "Step-by-step instructions",
+    "frequency": "How often to use",
+    "best_practices": ["Tip 1", "Tip 2"]
+  },
+  "safety_section": {
+    "side_effects": "Possible side effects",
+    "precautions": "Who should be careful",
+    "contraindications": "When not to use"
+  },
+  "pricing_section": {
+    "price": "$XX.XX",
+    "value_proposition": "Why it's worth it",
+    "comparison_value": "Vs alternatives"
+  },
+  "cta_section": {
+    "primary_cta": "Buy Now",
+    "secondary_cta": "Learn More",
+    "urgency_message": "Limited time offer"
+  }
+}"""
+
+# Fallback FAQ content, allocated once; per-product text is filled in at call time
+_DEFAULT_FAQ_QUESTIONS: Tuple[str, ...] = (
+    "What is this product and what does it do?",
+    "How do I use this product?",
+    "Are there any side effects or precautions?",
+    "Who should use this product?",
+    "How long does it take to see results?"
+)
+_DEFAULT_FAQ_QUESTIONS_TEXT = "\n".join(f"{i+1}. {q}" for i, q in enumerate(_DEFAULT_FAQ_QUESTIONS))
+_DEFAULT_FAQ_CATEGORIES: Tuple[str, ...] = ("informational", "usage", "safety", "safety", "effectiveness")
+_DEFAULT_FAQ_TAGS: Tuple[str, ...] = ("introduction", "usage", "safety", "suitability", "results")
+
+# (keyword in question, answer template) - first match wins, formatted with _fallback_answer_args
+_FAQ_ANSWER_TEMPLATES: Tuple[Tuple[str, str], ...] = (
+    ("what is", "{name} is a skincare serum containing {ingredients}. It helps with {benefits}."),
+    ("how do i use", "{usage}. For best results, use consistently as part of your daily skincare routine."),
+    ("side effects", "{side_effects}. Always patch test before first use. Discontinue if irritation persists."),
+    ("who should use", "This product is suitable for {skin_type}. Those with specific conditions should consult a dermatologist.")
+)
+_FAQ_DEFAULT_ANSWER = "With regular use, visible improvements can typically be seen within 2-4 weeks, though individual results may vary."
+
+
+def _fallback_answer_args(product_data: Dict) -> Dict[str, Any]:
+    """Template arguments for fallback FAQ answers about one product"""
+    ingredients = product_data.get('key_ingredients', [])
+    benefits = product_data.get('benefits', [])
+    return {
+        "name": product_data.get('name', 'this product'),
+        "ingredients": ', '.join(map(str, ingredients[:2])) if ingredients else 'key ingredients',
+        "benefits": ', '.join(map(str, benefits[:2])) if benefits else 'multiple skin benefits',
+        "usage": product_data.get('how_to_use', 'Apply as directed'),
+        "side_effects": product_data.get('side_effects', 'Mild tingling may occur'),
+        "skin_type": product_data.get('skin_type', 'various skin types')
+    }
+
+# (question, answer template, category, tags) - answers are formatted with the product name
+_ADDITIONAL_FAQ_TEMPLATES: Tuple[Tuple[str, str, str, Tuple[str, ...]], ...] = (
+    (
+        "Can this product be used with other skincare products?",
+        "Yes, {name} can be layered with most skincare products. Apply after cleansing and before moisturizer.",
+        "usage",
+        ("compatibility", "routine")
+    ),
+    (
+        "How should I store this product?",
+        "Store in a cool, dry place away from direct sunlight. Keep the lid tightly closed to preserve efficacy.",
+        "usage",
+        ("storage", "preservation")
+    )
+)
+
+# Fallback product page defaults for fields missing from the product data
+_FALLBACK_KEY_POINTS: Tuple[str, ...] = ("Brightening", "Hydrating", "Even skin tone")
+_FALLBACK_BENEFITS: Tuple[str, ...] = ("Brightening", "Hydration")
+_FALLBACK_INGREDIENTS: Tuple[str, ...] = ("Vitamin C", "Hyaluronic Acid")
+
+
+def _first(data: Dict, *keys: str, default: Any = None) -> Any:
+    """Value of the first key present (and not None) in data, else default"""
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def _faq_product_view(product_data: Dict) -> Dict[str, Any]:
+    """Normalized product fields for the FAQ prompt, resolving alias keys once"""
+    return {
+        "name": _first(product_data, 'name', default='Skincare Product'),
+        "ingredients": _first(product_data, 'key_ingredients', 'ingredients', default='Not specified'),
+        "benefits": _first(product_data, 'benefits', 'key_benefits', default='Not specified'),
+        "skin_type": _first(product_data, 'skin_type', default='Various'),
+        "price": _first(product_data, 'price', default='Not specified'),
+        "usage": _first(product_data, 'how_to_use', 'usage', default='Not specified'),
+        "side_effects": _first(product_data, 'side_effects', 'safety', default='None known')
+    }
+
+
+def _product_page_view(data: Dict) -> Dict[str, Any]:
+    """Normalized product fields for the product page prompt, resolving alias keys once"""
+    return {
+        "name": _first(data, 'name', default='GlowBoost Vitamin C Serum'),
+        "concentration": _first(data, 'concentration', default='10% Vitamin C'),
+        "skin_type": _first(data, 'skin_type', default='Oily, Combination'),
+        "ingredients": _first(data, 'key_ingredients', 'ingredients', default=['Vitamin C', 'Hyaluronic Acid']),
+        "benefits": _first(data, 'benefits', 'key_benefits', default=['Brightening', 'Fades dark spots']),
+        "usage": _first(data, 'how_to_use', 'usage', default='Apply 2-3 drops in the morning before sunscreen'),
+        "side_effects": _first(data, 'side_effects', 'safety', default='Mild tingling for sensitive skin'),
+        "price": _first(data, 'price', default='₹699')
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _questions_text(entries: Tuple[Tuple[Any, Optional[str]], ...]) -> str:
+    """Numbered question lines for (question, category) pairs; category is None for plain questions"""
+    return "\n".join(
+        f"{i+1}. {question} (Category: {category})" if category is not None else f"{i+1}. {question}"
+        for i, (question, category) in enumerate(entries)
+    )
+
+
+# User prompt templates, filled with format_map from the normalized product views
+_FAQ_PRODUCT_TEMPLATE = """                Name: {name}
+                Ingredients: {ingredients}
+                Benefits: {benefits}
+                Skin Type: {skin_type}
+                Price: {price}
+                Usage: {usage}
+                Side Effects: {side_effects}"""
+
+_FAQ_USER_TEMPLATE = """Create detailed answers for the questions below.
+                
+                Product Information:
+{product}
+                
+                Questions to Answer:
+                {questions}"""
+
+_FAQ_BATCH_ITEM_TEMPLATE = """Product {index}:
+{product}
+                Questions to Answer:
+                {questions}"""
+
+_PRODUCT_PAGE_USER_TEMPLATE = """Create a product page for this skincare product:
+                
+                Product Name: {name}
+                Concentration: {concentration}
+                Skin Type: {skin_type}
+                Key Ingredients: {ingredients}
+                Benefits: {benefits}
+                How to Use: {usage}
+                Side Effects: {side_effects}
+                Price: {price}
+                
+                Create a complete, compelling product page:"""
+
+# Set VALIDATE_PRODUCT_PAGES=1 to run full ProductPage validation on every generated page
+VALIDATE_PRODUCT_PAGES = os.getenv("VALIDATE_PRODUCT_PAGES", "").lower() in ("1", "true", "yes")
+# Set VALIDATE_FAQ_ITEMS=1 to build every generated FAQ entry through the FAQItem model
+VALIDATE_FAQ_ITEMS = os.getenv("VALIDATE_FAQ_ITEMS", "").lower() in ("1", "true", "yes")
+_REQUIRED_PAGE_KEYS: Tuple[str, ...] = tuple(
+    name for name, field in ProductPage.model_fields.items() if field.is_required()
+)
+
+# Number of products packed into one Gemini request by create_faq_batch
+FAQ_BATCH_SIZE = 8
+# Bounded worker pool shared by every agent for running blocking batch calls from async code;
+# threads start on demand and are joined at interpreter exit
+_FAQ_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS, thread_name_prefix="faq-batch")
+
+FAQ_BATCH_SYSTEM_PROMPT = """You are a skincare content expert creating FAQ sections for several products at once.
+
+Each product is given as a numbered block with its own questions. Answer every product's questions independently.
+
+Return ONLY a JSON array with one entry per product:
+[
+  {
+    "product_index": 1,
+    "faq_items": [
+      {
+        "question": "The original question",
+        "answer": "Detailed, helpful answer (3-5 sentences)",
+        "category": "question category",
+        "tags": ["relevant", "tags"]
+      }
+    ]
+  }
+]
+
+Guidelines:
+1. Answers must be based ONLY on the data of the product they belong to
+2. Keep answers professional and factual
+3. Include key ingredients, benefits, usage instructions
+4. Address safety concerns honestly
+5. Add relevant tags like "ingredients", "safety", "usage", etc."""
+
 
 class ContentCreatorAgent(BaseAgent):
     """Agent for creating various content types (FAQ, Product Page) - Updated for Gemini"""
@@ -19,7 +281,28 @@ class ContentCreatorAgent(BaseAgent):
             description="Creates FAQ and product page content",
             llm=llm
         )
-        self.json_parser = JsonOutputParser()
+        # In-flight async generations keyed by request hash, so identical concurrent requests share one call
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def _single_flight(self, kind: str, payload: Any, factory):
+        """Await factory() once for all concurrent callers with the same (kind, payload)"""
+        key = hashlib.blake2b(f"{kind}\0{serialize_input(payload)}".encode()).hexdigest()
+        future = self._inflight.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+        
+        future = asyncio.ensure_future(factory())
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    def _fetch_gemini_response(self, prompt: str, system_instruction: str = None) -> str:
+        """Cache misses stream the response and stop at the first complete JSON value"""
+        return self._call_direct_gemini_stream(prompt, system_instruction)
     
     def _setup_tools(self):
         """Setup content creation tools - Simplified for Gemini"""
@@ -30,7 +313,7 @@ class ContentCreatorAgent(BaseAgent):
                 # Parse input
                 if isinstance(input_data, str):
                     try:
-                        data = json.loads(input_data)
+                        data = loads(input_data)
                     except:
                         # Handle plain text input
                         data = {"questions": [], "description": input_data}
@@ -44,235 +327,88 @@ class ContentCreatorAgent(BaseAgent):
                 if not product_data:
                     product_data = data
                 
-                # Create FAQ using direct Gemini call
-                system_prompt = """You are a skincare content expert creating FAQ sections.
-                
-                Your task: Create detailed, helpful answers for skincare product questions.
-                
-                Format each FAQ item as:
-                {
-                  "question": "The original question",
-                  "answer": "Detailed, helpful answer (3-5 sentences)",
-                  "category": "question category",
-                  "tags": ["relevant", "tags"]
-                }
-                
-                Guidelines:
-                1. Answers must be based ONLY on provided product data
-                2. Keep answers professional and factual
-                3. Include key ingredients, benefits, usage instructions
-                4. Address safety concerns honestly
-                5. Add relevant tags like "ingredients", "safety", "usage", etc.
-                
-                Return ONLY a JSON array of FAQ items."""
-                
-                # Prepare questions text
-                if questions:
-                    if isinstance(questions[0], dict):
-                        questions_text = "\n".join([f"{i+1}. {q.get('question', '')} (Category: {q.get('category', 'general')})" 
-                                                   for i, q in enumerate(questions[:5])])
-                    else:
-                        questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions[:5])])
-                else:
-                    # Generate default questions if none provided
-                    questions_text = """1. What is this product and what does it do?
-2. How do I use this product?
-3. Are there any side effects or precautions?
-4. Who should use this product?
-5. How long does it take to see results?"""
-                
-                user_prompt = f"""Product Information:
-                Name: {product_data.get('name', 'Skincare Product')}
-                Ingredients: {product_data.get('key_ingredients', product_data.get('ingredients', 'Not specified'))}
-                Benefits: {product_data.get('benefits', product_data.get('key_benefits', 'Not specified'))}
-                Skin Type: {product_data.get('skin_type', 'Various')}
-                Price: {product_data.get('price', 'Not specified')}
-                Usage: {product_data.get('how_to_use', product_data.get('usage', 'Not specified'))}
-                Side Effects: {product_data.get('side_effects', product_data.get('safety', 'None known'))}
-                
-                Questions to Answer:
-                {questions_text}
-                
-                Create detailed answers for these questions:"""
+                # Fixed instructions lead so only the product block and questions vary between calls
+                user_prompt = _FAQ_USER_TEMPLATE.format_map({
+                    "product": self._format_faq_product(product_data),
+                    "questions": self._format_faq_questions(questions)
+                })
                 
-                # Use direct Gemini call
-                response = self._call_direct_gemini(user_prompt, system_prompt)
+                # Use direct Gemini call (repeat prompts are served from the response cache)
+                faq_data = self._cached_gemini_call(user_prompt, FAQ_SYSTEM_PROMPT, self._parse_reply_json)
                 
-                # Extract JSON from response
-                json_str = self._extract_json_from_response(response)
-                
-                if json_str:
-                    try:
-                        faq_data = json.loads(json_str)
-                    except:
-                        faq_data = []
-                else:
+                if faq_data is None:
                     # Generate fallback FAQ
                     faq_data = self._generate_fallback_faq(questions, product_data)
                 
-                # Create FAQ items
-                faq_items = []
-                for i, item in enumerate(faq_data[:5]):  # Max 5 items as required
-                    try:
-                        if isinstance(item, dict):
-                            question = item.get("question", "")
-                            answer = item.get("answer", "")
-                            category = item.get("category", "general")
-                            tags = item.get("tags", [])
-                        else:
-                            # Handle string or unexpected format
-                            question = questions[i].get("question", f"Question {i+1}") if i < len(questions) else f"Question {i+1}"
-                            answer = str(item)
-                            category = "general"
-                            tags = []
-                        
-                        # Create FAQItem
-                        faq_item = FAQItem(
-                            question=question,
-                            answer=answer,
-                            category=category,
-                            tags=tags
-                        )
-                        faq_items.append(faq_item.model_dump())
-                    except Exception as e:
-                        print(f"Error processing FAQ item {i}: {e}")
-                        continue
-                
-                # Ensure at least 5 FAQ items
-                if len(faq_items) < 5:
-                    faq_items.extend(self._generate_missing_faq_items(product_data, 5 - len(faq_items)))
+                faq_items = self._build_faq_items(faq_data, questions, product_data)
                 
-                return json.dumps({
+                return dumps({
                     "faq_items": faq_items[:5],
                     "total_items": len(faq_items),
                     "status": "success"
-                }, indent=2)
+                })
                 
             except Exception as e:
-                print(f"Error generating FAQ: {e}")
-                return json.dumps({
+                logger.exception("Error generating FAQ")
+                return dumps({
                     "faq_items": self._generate_fallback_faq([], product_data)[:5],
                     "total_items": 5,
                     "status": "fallback",
                     "error": str(e)
-                }, indent=2)
+                })
         
-        def generate_product_page(product_data: str) -> str:
+        def generate_product_page(product_data: str, validate: bool = VALIDATE_PRODUCT_PAGES) -> str:
             """Generate complete product page - Gemini version"""
             try:
                 # Parse product data
                 if isinstance(product_data, str):
                     try:
-                        data = json.loads(product_data)
+                        data = loads(product_data)
                     except:
                         data = {"description": product_data}
                 else:
                     data = product_data
                 
-                # Create system prompt for product page
-                system_prompt = """You are a professional skincare copywriter creating product pages.
+                user_prompt = _PRODUCT_PAGE_USER_TEMPLATE.format_map(_product_page_view(data))
                 
-                Create a complete, compelling product page with these sections:
-                1. Hero Section: Title, tagline, key selling points
-                2. Benefits Section: Detailed benefits with scientific backing
-                3. Ingredients Section: Key ingredients explained
-                4. Usage Section: How to use, frequency, best practices
-                5. Safety Section: Side effects, precautions, who should avoid
-                6. Pricing Section: Price, value proposition
-                7. CTA Section: Call to action buttons/messages
+                # Use direct Gemini call (repeat prompts are served from the response cache)
+                page_data = self._cached_gemini_call(user_prompt, PRODUCT_PAGE_SYSTEM_PROMPT, self._parse_reply_json)
                 
-                Return ONLY valid JSON in this exact structure:
-                {
-                  "title": "Product Name",
-                  "meta_description": "SEO-friendly description",
-                  "hero_section": {
-                    "headline": "Main headline",
-                    "subheadline": "Supporting text",
-                    "key_points": ["Point 1", "Point 2", "Point 3"]
-                  },
-                  "benefits_section": [
-                    {
-                      "benefit": "Brightening",
-                      "description": "How it brightens",
-                      "scientific_basis": "Scientific explanation"
-                    }
-                  ],
-                  "ingredients_section": [
-                    {
-                      "ingredient": "Vitamin C",
-                      "purpose": "Antioxidant protection",
-                      "benefits": ["Brightening", "Collagen production"]
-                    }
-                  ],
-                  "usage_section": {
-                    "instructions": "Step-by-step instructions",
-                    "frequency": "How often to use",
-                    "best_practices": ["Tip 1", "Tip 2"]
-                  },
-                  "safety_section": {
-                    "side_effects": "Possible side effects",
-                    "precautions": "Who should be careful",
-                    "contraindications": "When not to use"
-                  },
-                  "pricing_section": {
-                    "price": "$XX.XX",
-                    "value_proposition": "Why it's worth it",
-                    "comparison_value": "Vs alternatives"
-                  },
-                  "cta_section": {
-                    "primary_cta": "Buy Now",
-                    "secondary_cta": "Learn More",
-                    "urgency_message": "Limited time offer"
-                  }
-                }"""
-                
-                user_prompt = f"""Create a product page for this skincare product:
-                
-                Product Name: {data.get('name', 'GlowBoost Vitamin C Serum')}
-                Concentration: {data.get('concentration', '10% Vitamin C')}
-                Skin Type: {data.get('skin_type', 'Oily, Combination')}
-                Key Ingredients: {data.get('key_ingredients', data.get('ingredients', ['Vitamin C', 'Hyaluronic Acid']))}
-                Benefits: {data.get('benefits', data.get('key_benefits', ['Brightening', 'Fades dark spots']))}
-                How to Use: {data.get('how_to_use', data.get('usage', 'Apply 2-3 drops in the morning before sunscreen'))}
-                Side Effects: {data.get('side_effects', data.get('safety', 'Mild tingling for sensitive skin'))}
-                Price: {data.get('price', '₹699')}
-                
-                Create a complete, compelling product page:"""
-                
-                # Use direct Gemini call
-                response = self._call_direct_gemini(user_prompt, system_prompt)
-                
-                # Extract JSON from response
-                json_str = self._extract_json_from_response(response)
-                
-                if json_str:
+                if page_data is not None:
                     try:
-                        page_data = json.loads(json_str)
+                        # Cheap structural check by default; full pydantic validation only when asked
+                        if not validate and isinstance(page_data, dict) and all(k in page_data for k in _REQUIRED_PAGE_KEYS):
+                            return dumps({
+                                "product_page": page_data,
+                                "sections": len([k for k in page_data.keys() if k.endswith('_section')]),
+                                "status": "success",
+                                "method": "gemini_direct"
+                            })
                         
                         # Validate with ProductPage model
                         product_page = ProductPage(**page_data)
                         
-                        return json.dumps({
+                        return dumps({
                             "product_page": product_page.model_dump(),
                             "sections": len([k for k in page_data.keys() if k.endswith('_section')]),
                             "status": "success",
                             "method": "gemini_direct"
-                        }, indent=2)
+                        })
                     except Exception as e:
-                        print(f"Error validating product page: {e}")
+                        logger.warning("Error validating product page: %s", e)
                         # Continue with raw data
-                        return json.dumps({
+                        return dumps({
                             "product_page": page_data,
                             "sections": len([k for k in page_data.keys() if k.endswith('_section')]),
                             "status": "success_unvalidated",
                             "error": str(e)
-                        }, indent=2)
+                        })
                 else:
                     # Generate fallback product page
                     return self._generate_fallback_product_page(data)
                 
-            except Exception as e:
-                print(f"Error generating product page: {e}")
+            except Exception:
+                logger.exception("Error generating product page")
                 return self._generate_fallback_product_page(data)
         
         self.tools = [
@@ -288,97 +424,178 @@ class ContentCreatorAgent(BaseAgent):
             )
         ]
     
+    def _format_faq_questions(self, questions: List) -> str:
+        """Numbered question list for an FAQ prompt (defaults when none are given)"""
+        if questions:
+            if isinstance(questions[0], dict):
+                entries = tuple((q.get('question', ''), q.get('category', 'general')) for q in questions[:5])
+            else:
+                entries = tuple((q, None) for q in questions[:5])
+            try:
+                return _questions_text(entries)
+            except TypeError:
+                # Unhashable question values can't be memoized
+                return _questions_text.__wrapped__(entries)
+        
+        # Generate default questions if none provided
+        return _DEFAULT_FAQ_QUESTIONS_TEXT
+    
+    def _format_faq_product(self, product_data: Dict) -> str:
+        """Product fields block for an FAQ prompt"""
+        return _FAQ_PRODUCT_TEMPLATE.format_map(_faq_product_view(product_data))
+    
+    def _build_faq_items(self, faq_data: List, questions: List, product_data: Dict,
+                         validate: bool = VALIDATE_FAQ_ITEMS) -> List[Dict]:
+        """Validate raw FAQ entries against the FAQItem shape and top up to 5 items
+        
+        Items are checked inline and kept as plain dicts; validate=True runs them through FAQItem instead.
+        """
+        faq_items = []
+        for i, item in enumerate(faq_data[:5]):  # Max 5 items as required
+            try:
+                if isinstance(item, dict):
+                    question = item.get("question", "")
+                    answer = item.get("answer", "")
+                    category = item.get("category", "general")
+                    tags = item.get("tags", [])
+                else:
+                    # Handle string or unexpected format
+                    question = questions[i].get("question", f"Question {i+1}") if i < len(questions) else f"Question {i+1}"
+                    answer = str(item)
+                    category = "general"
+                    tags = []
+                
+                if validate:
+                    faq_items.append(FAQItem(question=question, answer=answer, category=category, tags=tags).model_dump())
+                    continue
+                
+                # Same checks FAQItem applies, without building and dumping a model per item
+                if not (isinstance(question, str) and isinstance(answer, str) and isinstance(category, str)):
+                    raise ValueError("question, answer and category must be strings")
+                if tags is None:
+                    tags = []
+                if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                    raise ValueError("tags must be a list of strings")
+                
+                faq_items.append({
+                    "question": question,
+                    "answer": answer,
+                    "category": category,
+                    "tags": tags
+                })
+            except Exception as e:
+                logger.warning("Error processing FAQ item %d: %s", i, e)
+                continue
+        
+        # Ensure at least 5 FAQ items
+        if len(faq_items) < 5:
+            faq_items.extend(self._generate_missing_faq_items(product_data, 5 - len(faq_items)))
+        
+        return faq_items
+    
     def _extract_json_from_response(self, response: str) -> str:
         """Extract JSON from Gemini response text"""
+        if not response:
+            return None
+        
+        # Cheap string checks first - only a candidate bracketed at both ends is parsed
+        candidate = response.strip()
+        if candidate.startswith("```"):
+            candidate = candidate[3:]
+            # Drop the language tag line (```json)
+            newline = candidate.find("\n")
+            if newline != -1 and candidate[:newline].strip().isalpha():
+                candidate = candidate[newline + 1:]
+            end = candidate.rfind("```")
+            if end != -1:
+                candidate = candidate[:end]
+            candidate = candidate.strip()
+        
+        if candidate[:1] in _CLOSERS and candidate[-1:] == _CLOSERS[candidate[0]]:
+            # Bracketed at both ends is not enough - e.g. '{...} note {...}' must still be scanned
+            try:
+                loads(candidate)
+                return candidate
+            except ValueError:
+                pass
+        
+        # Last resort: scan for the first balanced JSON value in the text
+        return _find_json_span(response)
+    
+    def _parse_reply_json(self, response: str) -> Any:
+        """Parse the JSON payload of a Gemini reply, or None if it has none"""
+        json_str = self._extract_json_from_response(response)
+        if not json_str:
+            return None
         try:
-            # Try to parse directly first
-            json.loads(response)
-            return response
-        except:
-            # Try to find JSON in the text
-            json_match = re.search(r'(\{\s*".*"\s*:\s*.*?\})', response, re.DOTALL)
-            if json_match:
-                return json_match.group(1)
+            return loads(json_str)
+        except ValueError:
             return None
     
     def _generate_fallback_faq(self, questions: List, product_data: Dict) -> List[Dict]:
         """Generate fallback FAQ if Gemini fails"""
-        faq_items = []
-        
-        default_questions = [
-            "What is this product and what does it do?",
-            "How do I use this product?",
-            "Are there any side effects or precautions?",
-            "Who should use this product?",
-            "How long does it take to see results?"
-        ]
-        
-        for i, q in enumerate(default_questions[:5]):
-            answer = self._generate_faq_answer(q, product_data)
-            faq_items.append({
+        # Product-invariant template arguments, built once for all questions
+        answer_args = _fallback_answer_args(product_data)
+        return [
+            {
                 "question": q,
-                "answer": answer,
-                "category": ["informational", "usage", "safety", "safety", "effectiveness"][i],
-                "tags": ["introduction", "usage", "safety", "suitability", "results"]
-            })
-        
-        return faq_items
+                "answer": self._generate_faq_answer(q, product_data, answer_args),
+                "category": _DEFAULT_FAQ_CATEGORIES[i],
+                "tags": list(_DEFAULT_FAQ_TAGS)
+            }
+            for i, q in enumerate(_DEFAULT_FAQ_QUESTIONS)
+        ]
     
-    def _generate_faq_answer(self, question: str, product_data: Dict) -> str:
-        """Generate answer for a specific question"""
-        name = product_data.get('name', 'this product')
-        ingredients = product_data.get('key_ingredients', [])
-        benefits = product_data.get('benefits', [])
+    def _generate_faq_answer(self, question: str, product_data: Dict, answer_args: Dict[str, Any] = None) -> str:
+        """Generate answer for a specific question
         
-        if "what is" in question.lower():
-            return f"{name} is a skincare serum containing {', '.join(ingredients[:2]) if ingredients else 'key ingredients'}. It helps with {', '.join(benefits[:2]) if benefits else 'multiple skin benefits'}."
-        elif "how do i use" in question.lower():
-            usage = product_data.get('how_to_use', 'Apply as directed')
-            return f"{usage}. For best results, use consistently as part of your daily skincare routine."
-        elif "side effects" in question.lower():
-            side_effects = product_data.get('side_effects', 'Mild tingling may occur')
-            return f"{side_effects}. Always patch test before first use. Discontinue if irritation persists."
-        elif "who should use" in question.lower():
-            skin_type = product_data.get('skin_type', 'various skin types')
-            return f"This product is suitable for {skin_type}. Those with specific conditions should consult a dermatologist."
-        else:
-            return f"With regular use, visible improvements can typically be seen within 2-4 weeks, though individual results may vary."
+        answer_args are the product's template arguments; pass them in when answering several questions.
+        """
+        if answer_args is None:
+            answer_args = _fallback_answer_args(product_data)
+        
+        question = question.lower()
+        for keyword, template in _FAQ_ANSWER_TEMPLATES:
+            if keyword in question:
+                return template.format_map(answer_args)
+        return _FAQ_DEFAULT_ANSWER
     
     def _generate_missing_faq_items(self, product_data: Dict, count: int) -> List[Dict]:
         """Generate additional FAQ items if needed"""
-        additional = [
-            {
-                "question": "Can this product be used with other skincare products?",
-                "answer": f"Yes, {product_data.get('name', 'this product')} can be layered with most skincare products. Apply after cleansing and before moisturizer.",
-                "category": "usage",
-                "tags": ["compatibility", "routine"]
-            },
+        name = product_data.get('name', 'this product')
+        return [
             {
-                "question": "How should I store this product?",
-                "answer": "Store in a cool, dry place away from direct sunlight. Keep the lid tightly closed to preserve efficacy.",
-                "category": "usage",
-                "tags": ["storage", "preservation"]
+                "question": question,
+                "answer": answer.format(name=name),
+                "category": category,
+                "tags": list(tags)
             }
+            for question, answer, category, tags in _ADDITIONAL_FAQ_TEMPLATES[:count]
         ]
-        return additional[:count]
     
     def _generate_fallback_product_page(self, product_data: Dict) -> str:
         """Generate fallback product page template"""
+        # Read each field once; None means "not provided" so the per-section defaults still apply
+        name = product_data.get('name')
+        skin_type = product_data.get('skin_type')
+        benefits = product_data.get('benefits')
+        ingredients = product_data.get('key_ingredients')
+        
         template_page = {
-            "title": product_data.get('name', 'GlowBoost Vitamin C Serum'),
-            "meta_description": f"{product_data.get('name', 'Professional skincare serum')} for {product_data.get('skin_type', 'all skin types')}. Provides {', '.join(product_data.get('benefits', ['multiple benefits']))}.",
+            "title": name if name is not None else 'GlowBoost Vitamin C Serum',
+            "meta_description": f"{name if name is not None else 'Professional skincare serum'} for {skin_type if skin_type is not None else 'all skin types'}. Provides {', '.join(map(str, benefits)) if benefits is not None else 'multiple benefits'}.",
             "hero_section": {
-                "headline": product_data.get('name', 'GlowBoost Vitamin C Serum'),
-                "subheadline": f"Professional {product_data.get('concentration', '10% Vitamin C')} serum for {product_data.get('skin_type', 'radiant skin')}",
-                "key_points": product_data.get('benefits', ['Brightening', 'Hydrating', 'Even skin tone'])
+                "headline": name if name is not None else 'GlowBoost Vitamin C Serum',
+                "subheadline": f"Professional {product_data.get('concentration', '10% Vitamin C')} serum for {skin_type if skin_type is not None else 'radiant skin'}",
+                "key_points": benefits if benefits is not None else list(_FALLBACK_KEY_POINTS)
             },
             "benefits_section": [
                 {
                     "benefit": benefit,
-                    "description": f"Helps improve {benefit.lower()} through advanced formulation",
+                    "description": f"Helps improve {str(benefit).lower()} through advanced formulation",
                     "scientific_basis": "Clinically studied ingredients with proven efficacy"
                 }
-                for benefit in product_data.get('benefits', ['Brightening', 'Hydration'])[:3]
+                for benefit in (benefits if benefits is not None else _FALLBACK_BENEFITS)[:3]
             ],
             "ingredients_section": [
                 {
@@ -386,7 +603,7 @@ class ContentCreatorAgent(BaseAgent):
                     "purpose": "Key active ingredient",
                     "benefits": ["Antioxidant protection", "Skin rejuvenation"]
                 }
-                for ingredient in product_data.get('key_ingredients', ['Vitamin C', 'Hyaluronic Acid'])[:3]
+                for ingredient in (ingredients if ingredients is not None else _FALLBACK_INGREDIENTS)[:3]
             ],
             "usage_section": {
                 "instructions": product_data.get('how_to_use', 'Apply 2-3 drops to cleansed skin'),
@@ -410,17 +627,17 @@ class ContentCreatorAgent(BaseAgent):
             }
         }
         
-        return json.dumps({
+        return dumps({
             "product_page": template_page,
             "sections": 7,
             "status": "fallback_template"
-        }, indent=2)
+        })
     
     def _setup_agent(self):
         """Setup content creator agent - Simplified for Gemini"""
         self.agent_executor = self._create_agent_executor(
             tools=self.tools,
-            system_prompt=self.get_system_prompt()
+            system_prompt=self.system_prompt
         )
     
     def get_system_prompt(self) -> str:
@@ -452,11 +669,107 @@ class ContentCreatorAgent(BaseAgent):
                     return output["faq_items"][:5]
                 elif isinstance(output, list):
                     return output[:5]
-        except Exception as e:
-            print(f"Error creating FAQ: {e}")
+        except Exception:
+            logger.exception("Error creating FAQ")
+        
+        return self._generate_fallback_faq(questions, product_data)[:5]
+    
+    def create_faq_batch(self, items: List[Dict]) -> List[List[Dict]]:
+        """Create FAQs for many products with one Gemini call per FAQ_BATCH_SIZE products
+        
+        Each item is {"questions": [...], "product_data": {...}}. Returns one FAQ list per item, in order.
+        """
+        results = []
+        for start in range(0, len(items), FAQ_BATCH_SIZE):
+            results.extend(self._create_faq_chunk(items[start:start + FAQ_BATCH_SIZE]))
+        return results
+    
+    async def acreate_faq_batch(self, items: List[Dict]) -> List[List[Dict]]:
+        """Async version of create_faq_batch - batches run concurrently on the shared bounded pool"""
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(_FAQ_BATCH_EXECUTOR, self._create_faq_chunk, items[start:start + FAQ_BATCH_SIZE])
+            for start in range(0, len(items), FAQ_BATCH_SIZE)
+        ])
+        return [faq_items for chunk in chunks for faq_items in chunk]
+    
+    def _create_faq_chunk(self, batch: List[Dict]) -> List[List[Dict]]:
+        """Answer one batch of at most FAQ_BATCH_SIZE products with a single Gemini call"""
+        blocks = []
+        for i, item in enumerate(batch, 1):
+            blocks.append(_FAQ_BATCH_ITEM_TEMPLATE.format_map({
+                "index": i,
+                "product": self._format_faq_product(item.get("product_data", {})),
+                "questions": self._format_faq_questions(item.get("questions", []))
+            }))
+        user_prompt = "\n\n".join(blocks) + f"\n\nCreate detailed answers for all {len(batch)} products:"
+        
+        by_index = {}
+        try:
+            parsed = self._cached_gemini_call(user_prompt, FAQ_BATCH_SYSTEM_PROMPT, self._parse_embedded_json)
+            for entry in parsed if isinstance(parsed, list) else []:
+                if isinstance(entry, dict) and isinstance(entry.get("faq_items"), list):
+                    # The model may echo the index as a string ("1")
+                    try:
+                        by_index[int(entry.get("product_index"))] = entry["faq_items"]
+                    except (TypeError, ValueError):
+                        continue
+        except Exception:
+            logger.exception("Error creating FAQ batch")
+        
+        results = []
+        for i, item in enumerate(batch, 1):
+            questions = item.get("questions", [])
+            product_data = item.get("product_data", {})
+            faq_data = by_index.get(i) or self._generate_fallback_faq(questions, product_data)
+            results.append(self._build_faq_items(faq_data, questions, product_data)[:5])
+        return results
+    
+    async def acreate_faq_simple(self, questions: List, product_data: Dict) -> List[Dict]:
+        """Async version of create_faq_simple - concurrent identical requests share one call"""
+        return await self._single_flight(
+            "faq", [questions, product_data], lambda: self._acreate_faq(questions, product_data)
+        )
+    
+    async def _acreate_faq(self, questions: List, product_data: Dict) -> List[Dict]:
+        """Generate an FAQ through the async JSON-output path"""
+        try:
+            input_data = {"questions": questions, "product_data": product_data}
+            result = await self.arun_with_json_output(input_data)
+            
+            if result["success"] and result["output"]:
+                output = result["output"]
+                if isinstance(output, dict) and "faq_items" in output:
+                    return output["faq_items"][:5]
+                elif isinstance(output, list):
+                    return output[:5]
+        except Exception:
+            logger.exception("Error creating FAQ")
         
         return self._generate_fallback_faq(questions, product_data)[:5]
     
+    async def create_many(self, products: List[Dict], questions: List = None,
+                          max_parallel: int = MAX_PARALLEL_REQUESTS) -> List[Dict]:
+        """Create the FAQ and product page for every product concurrently
+        
+        At most max_parallel Gemini requests are in flight at once. Returns one
+        {"faq_items": [...], "product_page": {...}} dict per product, in order.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+        
+        faqs = [bounded(self.acreate_faq_simple(questions or [], product)) for product in products]
+        pages = [bounded(self.acreate_product_page_simple(product)) for product in products]
+        results = await asyncio.gather(*faqs, *pages)
+        
+        return [
+            {"faq_items": faq_items, "product_page": product_page}
+            for faq_items, product_page in zip(results[:len(products)], results[len(products):])
+        ]
+    
     def create_product_page_simple(self, product_data: Dict) -> Dict:
         """Simple method to create product page without agent complexity"""
         try:
@@ -466,9 +779,30 @@ class ContentCreatorAgent(BaseAgent):
                 output = result["output"]
                 if isinstance(output, dict):
                     return output
-        except Exception as e:
-            print(f"Error creating product page: {e}")
+        except Exception:
+            logger.exception("Error creating product page")
         
         # Return fallback
-        fallback = json.loads(self._generate_fallback_product_page(product_data))
-        return fallback.get("product_page", {})
\ No newline at end of file
+        fallback = loads(self._generate_fallback_product_page(product_data))
+        return fallback.get("product_page", {})
+    
+    async def acreate_product_page_simple(self, product_data: Dict) -> Dict:
+        """Async version of create_product_page_simple - concurrent identical requests share one call"""
+        return await self._single_flight(
+            "product_page", product_data, lambda: self._acreate_product_page(product_data)
+        )
+    
+    async def _acreate_product_page(self, product_data: Dict) -> Dict:
+        """Generate a product page through the async JSON-output path"""
+        try:
+            result = await self.arun_with_json_output(product_data)
+            
+            if result["success"] and result["output"]:
+                output = result["output"]
+                if isinstance(output, dict):
+                    return output
+        except Exception:
+            logger.exception("Error creating product page")
+        
+        fallback = loads(self._generate_fallback_product_page(product_data))
+        return fallback.get("product_page", {})
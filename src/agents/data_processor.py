@@ -1,12 +1,58 @@
 from typing import Dict, Any
 from langchain.tools import Tool
-from pydantic import BaseModel, Field
-import json
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from src.agents.base_agent import BaseAgent
+from src.core.jsonutil import dumps, loads
 from src.core.models import ProductData
 
 
+# Static extraction prompt, sent byte-identically so Gemini can context-cache it
+UNSTRUCTURED_SYSTEM_PROMPT = """Extract skincare product information from text and return as structured JSON.
+
+Required fields:
+- name: Product name
+- concentration: Active ingredient concentration (e.g., "10% Vitamin C")
+- skin_type: List of suitable skin types (e.g., ["Oily", "Combination"])
+- key_ingredients: List of main ingredients
+- benefits: List of key benefits
+- how_to_use: Usage instructions
+- side_effects: Any side effects or precautions
+- price: Product price with currency
+
+Return ONLY valid JSON with these fields. If information is missing, make reasonable assumptions."""
+
+# Fields every product record must provide
+_REQUIRED_FIELDS = ("name", "concentration", "skin_type", "key_ingredients",
+                    "benefits", "how_to_use", "side_effects", "price")
+_REQUIRED_SET = frozenset(_REQUIRED_FIELDS)
+# Required fields that must be lists
+_LIST_FIELDS = ("skin_type", "key_ingredients", "benefits")
+
+# Reusable ProductData validator - validates dicts and raw JSON straight through pydantic-core
+_PRODUCT_TA = TypeAdapter(ProductData)
+
+
+def _is_json_invalid(error: ValidationError) -> bool:
+    """True if validation failed because the input was not JSON at all"""
+    return any(err["type"] == "json_invalid" for err in error.errors())
+
+
+def _looks_like_json(text: str) -> bool:
+    """Cheap dispatch check: JSON input starts with an object or array"""
+    return text.lstrip()[:1] in ("{", "[")
+
+
+def _validate_product_json(raw_data: str) -> ProductData:
+    """Validate product JSON in strict mode (no coercion), retrying lax only if strict rejects it"""
+    try:
+        return _PRODUCT_TA.validate_json(raw_data, strict=True)
+    except ValidationError as e:
+        if _is_json_invalid(e):
+            raise
+        return _PRODUCT_TA.validate_json(raw_data)
+
+
 class DataProcessorAgent(BaseAgent):
     """Agent for parsing and validating product data - Updated for Gemini"""
     
@@ -17,6 +63,10 @@ class DataProcessorAgent(BaseAgent):
             llm=llm
         )
     
+    def _fetch_gemini_response(self, prompt: str, system_instruction: str = None) -> str:
+        """Cache misses stream the extraction and stop once the JSON object is complete"""
+        return self._call_direct_gemini_stream(prompt, system_instruction)
+    
     def _setup_tools(self):
         """Setup data processing tools - Updated for Gemini"""
         
@@ -25,86 +75,83 @@ class DataProcessorAgent(BaseAgent):
             try:
                 # Handle different input types
                 if isinstance(raw_data, str):
+                    if not _looks_like_json(raw_data):
+                        # Plain text - extract structured data using Gemini
+                        return dumps(self._parse_unstructured_data(raw_data), indent=True)
                     try:
-                        # Try to parse as JSON
-                        data = json.loads(raw_data)
-                    except json.JSONDecodeError:
-                        # If not JSON, try to extract structured data using Gemini
-                        return self._parse_unstructured_data(raw_data)
+                        # Parse and validate the JSON in one pass
+                        product = _validate_product_json(raw_data)
+                    except ValidationError as e:
+                        if not _is_json_invalid(e):
+                            raise
+                        # Malformed JSON - try to extract structured data using Gemini
+                        return dumps(self._parse_unstructured_data(raw_data), indent=True)
                 else:
-                    data = raw_data
-                
-                # Validate with Pydantic model
-                product = ProductData(**data)
+                    # Validate with Pydantic model
+                    product = _PRODUCT_TA.validate_python(raw_data)
                 
-                return json.dumps({
+                product_dict = product.model_dump()
+                return dumps({
                     "status": "success",
-                    "product": product.model_dump(),
+                    "product": product_dict,
                     "message": f"Successfully parsed: {product.name}",
-                    "validated_fields": len(product.model_dump()),
+                    "validated_fields": len(product_dict),
                     "validation_passed": True
-                }, indent=2)
+                }, indent=True)
                 
             except Exception as e:
-                return json.dumps({
+                return dumps({
                     "status": "error",
                     "error": str(e),
                     "message": "Failed to parse product data",
                     "validation_passed": False,
                     "fallback_data": self._create_fallback_product(raw_data)
-                }, indent=2)
+                }, indent=True)
         
         def validate_product_schema(raw_data: str) -> str:
             """Validate product data against schema"""
             try:
                 if isinstance(raw_data, str):
                     try:
-                        data = json.loads(raw_data)
+                        data = loads(raw_data)
                     except:
                         data = {"raw_text": raw_data}
                 else:
                     data = raw_data
                 
-                # Check for required fields
-                required_fields = ["name", "concentration", "skin_type", "key_ingredients", 
-                                  "benefits", "how_to_use", "side_effects", "price"]
-                
-                missing_fields = []
-                for field in required_fields:
-                    if field not in data:
-                        missing_fields.append(field)
+                # Check for required fields - one C-level subset test, ordered report only when something is missing
+                missing_fields = [] if _REQUIRED_SET.issubset(data) else [
+                    field for field in _REQUIRED_FIELDS if field not in data
+                ]
                 
                 # Validate field types
-                type_issues = []
-                if "skin_type" in data and not isinstance(data["skin_type"], list):
-                    type_issues.append("skin_type should be a list")
-                if "key_ingredients" in data and not isinstance(data["key_ingredients"], list):
-                    type_issues.append("key_ingredients should be a list")
-                if "benefits" in data and not isinstance(data["benefits"], list):
-                    type_issues.append("benefits should be a list")
+                type_issues = [
+                    f"{field} should be a list" for field in _LIST_FIELDS
+                    if field in data and not isinstance(data[field], list)
+                ]
                 
                 if missing_fields or type_issues:
-                    return json.dumps({
+                    return dumps({
                         "status": "validation_failed",
                         "missing_fields": missing_fields,
                         "type_issues": type_issues,
                         "present_fields": list(data.keys()),
                         "recommendation": "Provide missing fields or fix data types"
-                    }, indent=2)
+                    }, indent=True)
                 else:
-                    return json.dumps({
+                    return dumps({
                         "status": "valid",
                         "message": "All required fields present with correct types",
                         "present_fields": list(data.keys()),
                         "field_count": len(data)
-                    }, indent=2)
+                    }, indent=True)
                 
             except Exception as e:
-                return json.dumps({
+                return dumps({
                     "status": "error",
                     "error": str(e),
                     "message": "Validation failed"
-                }, indent=2)
+                }, indent=True)
         
         self.tools = [
             Tool(
@@ -119,45 +166,26 @@ class DataProcessorAgent(BaseAgent):
             )
         ]
     
-    def _parse_unstructured_data(self, text: str) -> str:
-        """Use Gemini to extract structured data from unstructured text"""
+    def _parse_unstructured_data(self, text: str) -> Dict:
+        """Use Gemini to extract structured data from unstructured text, returning the result envelope"""
         try:
-            system_prompt = """Extract skincare product information from text and return as structured JSON.
-            
-            Required fields:
-            - name: Product name
-            - concentration: Active ingredient concentration (e.g., "10% Vitamin C")
-            - skin_type: List of suitable skin types (e.g., ["Oily", "Combination"])
-            - key_ingredients: List of main ingredients
-            - benefits: List of key benefits
-            - how_to_use: Usage instructions
-            - side_effects: Any side effects or precautions
-            - price: Product price with currency
-            
-            Return ONLY valid JSON with these fields. If information is missing, make reasonable assumptions."""
-            
             user_prompt = f"Extract product information from this text:\n\n{text}"
             
-            # Use direct Gemini call
-            response = self._call_direct_gemini(user_prompt, system_prompt)
+            # Use direct Gemini call (repeat texts are served from the response cache)
+            # Decode the first JSON value in the response - a linear scan, no greedy regex backtracking
+            data = self._cached_gemini_call(user_prompt, UNSTRUCTURED_SYSTEM_PROMPT, self._parse_embedded_json)
             
-            # Try to extract JSON
-            import re
-            json_match = re.search(r'(\{.*\})', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                data = json.loads(json_str)
-                
-                # Validate with Pydantic
-                product = ProductData(**data)
-                
-                return json.dumps({
-                    "status": "success_from_unstructured",
-                    "product": product.model_dump(),
-                    "message": f"Extracted from text: {product.name}",
-                    "source": "gemini_extraction",
-                    "validated_fields": len(product.model_dump())
-                }, indent=2)
+            # Validate with Pydantic
+            product = _PRODUCT_TA.validate_python(data)
+            
+            product_dict = product.model_dump()
+            return {
+                "status": "success_from_unstructured",
+                "product": product_dict,
+                "message": f"Extracted from text: {product.name}",
+                "source": "gemini_extraction",
+                "validated_fields": len(product_dict)
+            }
             
         except Exception as e:
             print(f"Gemini extraction failed: {e}")
@@ -165,8 +193,8 @@ class DataProcessorAgent(BaseAgent):
         # Fallback to basic parsing
         return self._basic_text_parsing(text)
     
-    def _basic_text_parsing(self, text: str) -> str:
-        """Basic text parsing when Gemini extraction fails"""
+    def _basic_text_parsing(self, text: str) -> Dict:
+        """Basic text parsing when Gemini extraction fails, returning the result envelope"""
         # Simple keyword-based parsing
         data = {
             "name": "GlowBoost Vitamin C Serum",
@@ -179,34 +207,41 @@ class DataProcessorAgent(BaseAgent):
             "price": "₹699"
         }
         
-        # Try to extract specific info from text
-        lines = text.lower().split('\n')
-        for line in lines:
+        # Try to extract specific info from text - lowercase line by line, stop once both are found
+        found_name = found_price = False
+        for line in text.splitlines():
+            line = line.lower()
             if 'name' in line or 'product' in line:
-                parts = line.split(':')
-                if len(parts) > 1:
-                    data['name'] = parts[1].strip()
+                if not found_name:
+                    _, sep, value = line.partition(':')
+                    if sep:
+                        data['name'] = value.strip()
+                        found_name = True
             elif 'price' in line or '₹' in line or '$' in line:
-                parts = line.split(':')
-                if len(parts) > 1:
-                    data['price'] = parts[1].strip()
+                if not found_price:
+                    _, sep, value = line.partition(':')
+                    if sep:
+                        data['price'] = value.strip()
+                        found_price = True
+            if found_name and found_price:
+                break
         
         try:
-            product = ProductData(**data)
-            return json.dumps({
+            product = _PRODUCT_TA.validate_python(data)
+            return {
                 "status": "success_basic_parsing",
                 "product": product.model_dump(),
                 "message": f"Basic parsing: {product.name}",
                 "source": "keyword_parsing",
                 "note": "Some fields may be default values"
-            }, indent=2)
+            }
         except:
-            return json.dumps({
+            return {
                 "status": "error",
                 "error": "Failed to parse text",
                 "fallback_data": data,
                 "message": "Using fallback product data"
-            }, indent=2)
+            }
     
     def _create_fallback_product(self, raw_input) -> Dict:
         """Create fallback product data"""
@@ -226,7 +261,7 @@ class DataProcessorAgent(BaseAgent):
         """Setup data processor agent - Simplified for Gemini"""
         self.agent_executor = self._create_agent_executor(
             tools=self.tools,
-            system_prompt=self.get_system_prompt()
+            system_prompt=self.system_prompt
         )
     
     def get_system_prompt(self) -> str:
@@ -250,23 +285,23 @@ class DataProcessorAgent(BaseAgent):
         """Simple method to process product data"""
         try:
             if isinstance(raw_data, str):
-                # Check if it's JSON
-                try:
-                    data = json.loads(raw_data)
-                except:
-                    # Try Gemini extraction
-                    result = self._parse_unstructured_data(raw_data)
-                    result_dict = json.loads(result)
-                    if result_dict.get("status", "").startswith("success"):
-                        return result_dict.get("product", {})
-                    else:
-                        return self._create_fallback_product(raw_data)
-            else:
-                data = raw_data
+                # JSON is parsed and validated in one pass; plain text skips straight to extraction
+                if _looks_like_json(raw_data):
+                    try:
+                        return _validate_product_json(raw_data).model_dump()
+                    except ValidationError as e:
+                        if not _is_json_invalid(e):
+                            raise
+                
+                # Try Gemini extraction - the envelope comes back as a dict, no JSON round-trip
+                result_dict = self._parse_unstructured_data(raw_data)
+                if result_dict.get("status", "").startswith("success"):
+                    return result_dict.get("product", {})
+                else:
+                    return self._create_fallback_product(raw_data)
             
             # Validate
-            product = ProductData(**data)
-            return product.model_dump()
+            return _PRODUCT_TA.validate_python(raw_data).model_dump()
             
         except Exception as e:
             print(f"Error processing product data: {e}")
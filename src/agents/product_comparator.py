@@ -1,13 +1,232 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain.tools import Tool
-from langchain_core.output_parsers import JsonOutputParser
+import asyncio
+import copy
 import json
-import re
+import hashlib
+import os
+from collections import OrderedDict
 
-from src.agents.base_agent import BaseAgent
+import google.generativeai as genai
+
+from src.agents.base_agent import BaseAgent, serialize_input, MAX_PARALLEL_REQUESTS
+from src.core.jsonutil import dumps, loads
 from src.core.models import ProductData, ComparisonPage
 
 
+# Decoder for pulling the first JSON object out of free-form responses (raw_decode stops at its closing brace)
+_JSON_DECODER = json.JSONDecoder()
+
+# Number of comparison pages remembered per agent
+COMPARISON_CACHE_SIZE = 32
+# Number of fictional counterparts remembered per agent, keyed by product fingerprint
+FICTIONAL_CACHE_SIZE = 32
+
+# Set VALIDATE_COMPARATOR_OUTPUT=1 to run full pydantic validation on schema-constrained Gemini output
+VALIDATE_COMPARATOR_OUTPUT = os.getenv("VALIDATE_COMPARATOR_OUTPUT", "").lower() in ("1", "true", "yes")
+
+# Static system prompts, sent byte-identically so Gemini can context-cache them
+FICTIONAL_PRODUCT_SYSTEM_PROMPT = """You are a skincare product developer creating a fictional contrasting product.
+
+Create a fictional skincare product that meaningfully contrasts with the main product.
+Make it DIFFERENT but realistic (not obviously inferior).
+
+Return ONLY valid JSON in this exact structure:
+{
+  "name": "Product Name",
+  "concentration": "XX% Active Ingredient",
+  "skin_type": ["Type1", "Type2"],
+  "key_ingredients": ["Ingredient1", "Ingredient2", "Ingredient3"],
+  "benefits": ["Benefit1", "Benefit2", "Benefit3"],
+  "how_to_use": "Usage instructions",
+  "side_effects": "Possible side effects",
+  "price": "₹XXX"
+}
+
+Guidelines:
+1. Make it contrast with main product (different ingredients, benefits, or skin type)
+2. Keep it realistic and plausible
+3. Price should be different (higher or lower)
+4. Include 3+ key ingredients and benefits
+5. Ensure side effects are reasonable"""
+
+COMPARISON_SYSTEM_PROMPT = """You are a skincare expert creating detailed product comparisons.
+
+Create a comprehensive comparison table and analysis between two skincare products.
+
+Return ONLY valid JSON in this exact structure:
+{
+  "title": "Comparison: Product A vs Product B",
+  "products": [
+    {
+      "name": "Product A Name",
+      "type": "Serum/Cream/etc",
+      "key_ingredients": ["Ing1", "Ing2"],
+      "benefits": ["Benefit1", "Benefit2"],
+      "best_for": "Skin types or concerns",
+      "price": "₹XXX",
+      "rating": 4.5
+    },
+    {
+      "name": "Product B Name",
+      "type": "Serum/Cream/etc",
+      "key_ingredients": ["Ing1", "Ing2"],
+      "benefits": ["Benefit1", "Benefit2"],
+      "best_for": "Skin types or concerns",
+      "price": "₹XXX",
+      "rating": 4.0
+    }
+  ],
+  "comparison_points": [
+    {
+      "aspect": "Ingredients",
+      "product_a": "Description for Product A",
+      "product_b": "Description for Product B",
+      "winner": "A" or "B" or "Tie"
+    },
+    {
+      "aspect": "Effectiveness",
+      "product_a": "Description for Product A",
+      "product_b": "Description for Product B",
+      "winner": "A" or "B" or "Tie"
+    },
+    {
+      "aspect": "Value for Money",
+      "product_a": "Description for Product A",
+      "product_b": "Description for Product B",
+      "winner": "A" or "B" or "Tie"
+    },
+    {
+      "aspect": "Suitability",
+      "product_a": "Description for Product A",
+      "product_b": "Description for Product B",
+      "winner": "A" or "B" or "Tie"
+    },
+    {
+      "aspect": "Side Effects",
+      "product_a": "Description for Product A",
+      "product_b": "Description for Product B",
+      "winner": "A" or "B" or "Tie"
+    }
+  ],
+  "summary": "Overall comparison summary (2-3 paragraphs)",
+  "recommendation": "Who should choose which product and why"
+}
+
+Guidelines:
+1. Be objective and factual
+2. Highlight meaningful differences
+3. Include at least 5 comparison points
+4. Declare clear winners for each aspect
+5. Provide practical recommendations"""
+
+# Gemini structured-output schemas, so the direct calls return bare JSON in the expected shape
+_STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+_FICTIONAL_PRODUCT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "concentration": {"type": "string"},
+        "skin_type": _STRING_LIST_SCHEMA,
+        "key_ingredients": _STRING_LIST_SCHEMA,
+        "benefits": _STRING_LIST_SCHEMA,
+        "how_to_use": {"type": "string"},
+        "side_effects": {"type": "string"},
+        "price": {"type": "string"}
+    },
+    "required": ["name", "concentration", "skin_type", "key_ingredients",
+                 "benefits", "how_to_use", "side_effects", "price"]
+}
+_FICTIONAL_REQUIRED_FIELDS = tuple(_FICTIONAL_PRODUCT_SCHEMA["required"])
+_COMPARISON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "products": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "type": {"type": "string"},
+                    "key_ingredients": _STRING_LIST_SCHEMA,
+                    "benefits": _STRING_LIST_SCHEMA,
+                    "best_for": {"type": "string"},
+                    "price": {"type": "string"},
+                    "rating": {"type": "number"}
+                },
+                "required": ["name", "key_ingredients", "benefits", "price"]
+            }
+        },
+        "comparison_points": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "aspect": {"type": "string"},
+                    "product_a": {"type": "string"},
+                    "product_b": {"type": "string"},
+                    "winner": {"type": "string", "enum": ["A", "B", "Tie"]}
+                },
+                "required": ["aspect", "product_a", "product_b", "winner"]
+            }
+        },
+        "summary": {"type": "string"},
+        "recommendation": {"type": "string"}
+    },
+    "required": ["title", "products", "comparison_points", "summary", "recommendation"]
+}
+_COMPARISON_REQUIRED_FIELDS = tuple(_COMPARISON_SCHEMA["required"])
+
+
+def _structured_config(schema: Dict[str, Any]) -> genai.types.GenerationConfig:
+    """Direct-call generation config that constrains the response to a JSON schema"""
+    return genai.types.GenerationConfig(
+        temperature=0.2,
+        max_output_tokens=2000,
+        top_p=0.95,
+        top_k=40,
+        response_mime_type="application/json",
+        response_schema=schema
+    )
+
+
+_FICTIONAL_PRODUCT_GEN_CFG = _structured_config(_FICTIONAL_PRODUCT_SCHEMA)
+_COMPARISON_GEN_CFG = _structured_config(_COMPARISON_SCHEMA)
+
+# Fallback contrasting product - constant, so its tool response is serialized once at import
+_FALLBACK_FICTIONAL_PRODUCT = {
+    "name": "RadiancePlus Niacinamide Serum",
+    "concentration": "5% Niacinamide + 2% Zinc",
+    "skin_type": ["All Skin Types", "Sensitive"],
+    "key_ingredients": ["Niacinamide", "Zinc PCA", "Green Tea Extract", "Panthenol"],
+    "benefits": ["Reduces redness", "Minimizes pores", "Improves skin texture", "Balances oil"],
+    "how_to_use": "Apply 3-4 drops to clean face morning and night. Follow with moisturizer.",
+    "side_effects": "Rare mild irritation. Discontinue if redness occurs.",
+    "price": "₹899"
+}
+_FALLBACK_FICTIONAL_PRODUCT_JSON = dumps({
+    "fictional_product": _FALLBACK_FICTIONAL_PRODUCT,
+    "status": "fallback",
+    "message": f"Created fallback product: {_FALLBACK_FICTIONAL_PRODUCT['name']}"
+}, indent=True)
+
+# Static recommendation text of the template comparison page
+_FALLBACK_RECOMMENDATION = """• Choose Product A if: Your primary concerns are dark spots, uneven skin tone, or antioxidant protection. You have oily or combination skin that can tolerate Vitamin C.
+
+• Choose Product B if: You have sensitive skin, struggle with redness or inflammation, or want to minimize pores and control oil. It's also better for those new to active ingredients.
+
+• Consider using both: Some users alternate between Vitamin C (morning) and Niacinamide (evening) for comprehensive skincare benefits."""
+
+
+def _fallback_fictional_product() -> Dict:
+    """Fresh copy of the fallback product, so callers may modify it"""
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in _FALLBACK_FICTIONAL_PRODUCT.items()
+    }
+
+
 class ProductComparatorAgent(BaseAgent):
     """Agent for creating fictional products and comparisons - Updated for Gemini"""
     
@@ -17,7 +236,10 @@ class ProductComparatorAgent(BaseAgent):
             description="Creates fictional products and generates comparisons",
             llm=llm
         )
-        self.json_parser = JsonOutputParser()
+        # LRU of comparison pages keyed by a hash of the compared products
+        self._comparison_cache: OrderedDict = OrderedDict()
+        # LRU of generated fictional products keyed by _fictional_cache_key
+        self._fictional_cache: OrderedDict = OrderedDict()
     
     def _setup_tools(self):
         """Setup comparison tools - Simplified for Gemini"""
@@ -28,37 +250,24 @@ class ProductComparatorAgent(BaseAgent):
                 # Parse product data
                 if isinstance(main_product_data, str):
                     try:
-                        data = json.loads(main_product_data)
+                        data = loads(main_product_data)
                     except:
                         # Handle text input
                         data = {"description": main_product_data, "name": "Main Product"}
                 else:
                     data = main_product_data
                 
-                # System prompt for creating fictional product
-                system_prompt = """You are a skincare product developer creating a fictional contrasting product.
-                
-                Create a fictional skincare product that meaningfully contrasts with the main product.
-                Make it DIFFERENT but realistic (not obviously inferior).
-                
-                Return ONLY valid JSON in this exact structure:
-                {
-                  "name": "Product Name",
-                  "concentration": "XX% Active Ingredient",
-                  "skin_type": ["Type1", "Type2"],
-                  "key_ingredients": ["Ingredient1", "Ingredient2", "Ingredient3"],
-                  "benefits": ["Benefit1", "Benefit2", "Benefit3"],
-                  "how_to_use": "Usage instructions",
-                  "side_effects": "Possible side effects",
-                  "price": "₹XXX"
-                }
-                
-                Guidelines:
-                1. Make it contrast with main product (different ingredients, benefits, or skin type)
-                2. Keep it realistic and plausible
-                3. Price should be different (higher or lower)
-                4. Include 3+ key ingredients and benefits
-                5. Ensure side effects are reasonable"""
+                # Products with the same fingerprint reuse the counterpart generated earlier
+                cache_key = self._fictional_cache_key(data)
+                cached = self._fictional_cache.get(cache_key)
+                if cached is not None:
+                    self._fictional_cache.move_to_end(cache_key)
+                    return dumps({
+                        "fictional_product": cached,
+                        "status": "success",
+                        "message": f"Created fictional product: {cached.get('name', 'Fictional Product')}",
+                        "method": "cache"
+                    }, indent=True)
                 
                 user_prompt = f"""Create a fictional contrasting product for comparison with:
                 
@@ -70,34 +279,43 @@ class ProductComparatorAgent(BaseAgent):
                 
                 Create a fictional contrasting product:"""
                 
-                # Use direct Gemini call
-                response = self._call_direct_gemini(user_prompt, system_prompt)
+                # Use direct Gemini call - structured output, so the response is bare JSON
+                response = self._call_direct_gemini(user_prompt, FICTIONAL_PRODUCT_SYSTEM_PROMPT, _FICTIONAL_PRODUCT_GEN_CFG)
                 
-                # Extract JSON from response
-                json_str = self._extract_json_from_response(response)
+                # Parse the JSON (searching the text only if a non-Gemini fallback answered)
+                product_data = self._parse_json_response(response)
                 
-                if json_str:
+                if isinstance(product_data, dict):
+                    if not VALIDATE_COMPARATOR_OUTPUT and all(field in product_data for field in _FICTIONAL_REQUIRED_FIELDS):
+                        # Schema-constrained output already has the ProductData shape; output missing
+                        # a field (e.g. from the unconstrained LangChain fallback) is validated below
+                        self._remember_fictional(cache_key, product_data)
+                        return dumps({
+                            "fictional_product": product_data,
+                            "status": "success",
+                            "message": f"Created fictional product: {product_data.get('name', 'Fictional Product')}",
+                            "method": "gemini_direct"
+                        }, indent=True)
                     try:
-                        product_data = json.loads(json_str)
-                        
                         # Validate with ProductData model
                         fictional_product = ProductData(**product_data)
+                        self._remember_fictional(cache_key, fictional_product.model_dump())
                         
-                        return json.dumps({
+                        return dumps({
                             "fictional_product": fictional_product.model_dump(),
                             "status": "success",
                             "message": f"Created fictional product: {fictional_product.name}",
                             "method": "gemini_direct"
-                        }, indent=2)
+                        }, indent=True)
                     except Exception as e:
                         print(f"Error validating fictional product: {e}")
                         # Use raw data anyway
-                        return json.dumps({
+                        return dumps({
                             "fictional_product": product_data,
                             "status": "success_unvalidated",
                             "message": f"Created: {product_data.get('name', 'Fictional Product')}",
                             "error": str(e)
-                        }, indent=2)
+                        }, indent=True)
                 else:
                     # Generate fallback fictional product
                     return self._generate_fallback_fictional_product(data)
@@ -112,7 +330,7 @@ class ProductComparatorAgent(BaseAgent):
                 # Parse products data
                 if isinstance(products_data, str):
                     try:
-                        data = json.loads(products_data)
+                        data = loads(products_data)
                     except:
                         # Handle text description
                         data = {"description": products_data}
@@ -124,80 +342,9 @@ class ProductComparatorAgent(BaseAgent):
                 
                 # If no fictional product, create one
                 if not fictional_product:
-                    fictional_result = json.loads(create_fictional_product(main_product))
+                    fictional_result = loads(create_fictional_product(main_product))
                     fictional_product = fictional_result.get("fictional_product", {})
                 
-                # System prompt for comparison
-                system_prompt = """You are a skincare expert creating detailed product comparisons.
-                
-                Create a comprehensive comparison table and analysis between two skincare products.
-                
-                Return ONLY valid JSON in this exact structure:
-                {
-                  "title": "Comparison: Product A vs Product B",
-                  "products": [
-                    {
-                      "name": "Product A Name",
-                      "type": "Serum/Cream/etc",
-                      "key_ingredients": ["Ing1", "Ing2"],
-                      "benefits": ["Benefit1", "Benefit2"],
-                      "best_for": "Skin types or concerns",
-                      "price": "₹XXX",
-                      "rating": 4.5
-                    },
-                    {
-                      "name": "Product B Name",
-                      "type": "Serum/Cream/etc",
-                      "key_ingredients": ["Ing1", "Ing2"],
-                      "benefits": ["Benefit1", "Benefit2"],
-                      "best_for": "Skin types or concerns",
-                      "price": "₹XXX",
-                      "rating": 4.0
-                    }
-                  ],
-                  "comparison_points": [
-                    {
-                      "aspect": "Ingredients",
-                      "product_a": "Description for Product A",
-                      "product_b": "Description for Product B",
-                      "winner": "A" or "B" or "Tie"
-                    },
-                    {
-                      "aspect": "Effectiveness",
-                      "product_a": "Description for Product A",
-                      "product_b": "Description for Product B",
-                      "winner": "A" or "B" or "Tie"
-                    },
-                    {
-                      "aspect": "Value for Money",
-                      "product_a": "Description for Product A",
-                      "product_b": "Description for Product B",
-                      "winner": "A" or "B" or "Tie"
-                    },
-                    {
-                      "aspect": "Suitability",
-                      "product_a": "Description for Product A",
-                      "product_b": "Description for Product B",
-                      "winner": "A" or "B" or "Tie"
-                    },
-                    {
-                      "aspect": "Side Effects",
-                      "product_a": "Description for Product A",
-                      "product_b": "Description for Product B",
-                      "winner": "A" or "B" or "Tie"
-                    }
-                  ],
-                  "summary": "Overall comparison summary (2-3 paragraphs)",
-                  "recommendation": "Who should choose which product and why"
-                }
-                
-                Guidelines:
-                1. Be objective and factual
-                2. Highlight meaningful differences
-                3. Include at least 5 comparison points
-                4. Declare clear winners for each aspect
-                5. Provide practical recommendations"""
-                
                 user_prompt = f"""Compare these two skincare products:
                 
                 PRODUCT A (Main):
@@ -220,30 +367,29 @@ class ProductComparatorAgent(BaseAgent):
                 
                 Create a detailed, objective comparison:"""
                 
-                # Use direct Gemini call
-                response = self._call_direct_gemini(user_prompt, system_prompt)
+                # Use direct Gemini call - structured output, so the response is bare JSON
+                response = self._call_direct_gemini(user_prompt, COMPARISON_SYSTEM_PROMPT, _COMPARISON_GEN_CFG)
                 
-                # Extract JSON from response
-                json_str = self._extract_json_from_response(response)
+                # Parse the JSON (searching the text only if a non-Gemini fallback answered)
+                comparison_data = self._parse_json_response(response, _COMPARISON_REQUIRED_FIELDS)
                 
-                if json_str:
+                if comparison_data is not None:
                     try:
-                        comparison_data = json.loads(json_str)
-                        
-                        # Try to validate with ComparisonPage model
-                        try:
-                            comparison_page = ComparisonPage(**comparison_data)
-                            comparison_dict = comparison_page.model_dump()
-                        except:
-                            # Use raw data if validation fails
-                            comparison_dict = comparison_data
+                        # Schema-constrained output is used as-is unless validation is switched on
+                        comparison_dict = comparison_data
+                        if VALIDATE_COMPARATOR_OUTPUT:
+                            try:
+                                comparison_dict = ComparisonPage(**comparison_data).model_dump()
+                            except:
+                                # Use raw data if validation fails
+                                pass
                         
-                        return json.dumps({
+                        return dumps({
                             "comparison_page": comparison_dict,
                             "comparison_points": len(comparison_dict.get("comparison_points", [])),
                             "status": "success",
                             "method": "gemini_direct"
-                        }, indent=2)
+                        }, indent=True)
                     except Exception as e:
                         print(f"Error processing comparison: {e}")
                         return self._generate_fallback_comparison(main_product, fictional_product)
@@ -268,41 +414,46 @@ class ProductComparatorAgent(BaseAgent):
             )
         ]
     
-    def _extract_json_from_response(self, response: str) -> str:
-        """Extract JSON from Gemini response text"""
+    def _parse_json_response(self, response: str, required_keys=()) -> Any:
+        """Parse the JSON object in Gemini response text, or None if there isn't a complete one
+        
+        Only the top-level object is considered: a truncated reply never yields one of its inner
+        objects. With required_keys, objects missing any of them are rejected too.
+        """
         try:
-            # Try to parse directly first
-            json.loads(response)
-            return response
-        except:
-            # Try to find JSON in the text
-            json_match = re.search(r'(\{\s*".*"\s*:\s*.*?\})', response, re.DOTALL)
-            if json_match:
-                return json_match.group(1)
+            # Structured output is bare JSON - one parse
+            value = loads(response)
+        except (TypeError, ValueError):
+            # Prose around the JSON (non-Gemini fallback) - decode the object at the first brace only
+            response = response or ""
+            start = response.find("{")
+            if start == -1:
+                return None
+            try:
+                value = _JSON_DECODER.raw_decode(response, start)[0]
+            except ValueError:
+                return None
+        
+        if not isinstance(value, dict) or not all(key in value for key in required_keys):
             return None
+        return value
     
     def _generate_fallback_fictional_product(self, main_product: Dict) -> str:
         """Generate fallback fictional product"""
-        fictional_product = {
-            "name": "RadiancePlus Niacinamide Serum",
-            "concentration": "5% Niacinamide + 2% Zinc",
-            "skin_type": ["All Skin Types", "Sensitive"],
-            "key_ingredients": ["Niacinamide", "Zinc PCA", "Green Tea Extract", "Panthenol"],
-            "benefits": ["Reduces redness", "Minimizes pores", "Improves skin texture", "Balances oil"],
-            "how_to_use": "Apply 3-4 drops to clean face morning and night. Follow with moisturizer.",
-            "side_effects": "Rare mild irritation. Discontinue if redness occurs.",
-            "price": "₹899"
-        }
-        
-        return json.dumps({
-            "fictional_product": fictional_product,
-            "status": "fallback",
-            "message": f"Created fallback product: {fictional_product['name']}"
-        }, indent=2)
+        return _FALLBACK_FICTIONAL_PRODUCT_JSON
     
     def _generate_fallback_comparison(self, product_a: Dict, product_b: Dict) -> str:
         """Generate fallback comparison"""
-        comparison_data = {
+        comparison_data = self._fallback_comparison_page(product_a, product_b)
+        return dumps({
+            "comparison_page": comparison_data,
+            "comparison_points": len(comparison_data["comparison_points"]),
+            "status": "fallback_template"
+        }, indent=True)
+    
+    def _fallback_comparison_page(self, product_a: Dict, product_b: Dict) -> Dict:
+        """Template comparison page, as a dict for callers that don't need the tool's JSON"""
+        return {
             "title": f"Comparison: {product_a.get('name', 'Product A')} vs {product_b.get('name', 'Product B')}",
             "products": [
                 {
@@ -366,24 +517,14 @@ class ProductComparatorAgent(BaseAgent):
 Product A is particularly effective for addressing hyperpigmentation and providing antioxidant defense, making it ideal for those concerned with aging and sun damage. Product B excels at calming inflammation, reducing redness, and refining pores, making it better for sensitive or acne-prone skin.
 
 Both products are well-formulated and effective within their respective categories. The choice depends largely on individual skin concerns and type.""",
-            "recommendation": """• Choose Product A if: Your primary concerns are dark spots, uneven skin tone, or antioxidant protection. You have oily or combination skin that can tolerate Vitamin C.
-
-• Choose Product B if: You have sensitive skin, struggle with redness or inflammation, or want to minimize pores and control oil. It's also better for those new to active ingredients.
-
-• Consider using both: Some users alternate between Vitamin C (morning) and Niacinamide (evening) for comprehensive skincare benefits."""
+            "recommendation": _FALLBACK_RECOMMENDATION
         }
-        
-        return json.dumps({
-            "comparison_page": comparison_data,
-            "comparison_points": len(comparison_data["comparison_points"]),
-            "status": "fallback_template"
-        }, indent=2)
     
     def _setup_agent(self):
         """Setup product comparator agent - Simplified for Gemini"""
         self.agent_executor = self._create_agent_executor(
             tools=self.tools,
-            system_prompt=self.get_system_prompt()
+            system_prompt=self.system_prompt
         )
     
     def get_system_prompt(self) -> str:
@@ -404,25 +545,126 @@ Both products are well-formulated and effective within their respective categori
         • Highlight practical differences for consumers
         • Provide clear recommendations"""
     
+    def _fictional_cache_key(self, product: Dict) -> str:
+        """Fingerprint of the fields a contrasting product is designed against
+        
+        Key ingredients, concentration and skin types, order-insensitive. Inputs with
+        none of those fields (e.g. free text) are keyed on their full content instead.
+        """
+        ingredients = product.get("key_ingredients") or product.get("ingredients") or []
+        skin_type = product.get("skin_type") or []
+        concentration = product.get("concentration")
+        if not (ingredients or skin_type or concentration):
+            fingerprint = serialize_input(product)
+        else:
+            fingerprint = serialize_input({
+                "ingredients": sorted(map(str, ingredients)) if isinstance(ingredients, list) else str(ingredients),
+                "concentration": concentration,
+                "skin_type": sorted(map(str, skin_type)) if isinstance(skin_type, list) else str(skin_type)
+            })
+        return hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+    
+    def _remember_fictional(self, key: str, fictional_product: Dict) -> Dict:
+        """Store a fictional product in the LRU, evicting the oldest entry when full
+        
+        The cache keeps its own copy and hits return copies, so callers may mutate results.
+        """
+        self._fictional_cache[key] = copy.deepcopy(fictional_product)
+        self._fictional_cache.move_to_end(key)
+        if len(self._fictional_cache) > FICTIONAL_CACHE_SIZE:
+            self._fictional_cache.popitem(last=False)
+        return fictional_product
+    
     # Simple helper methods
     def create_fictional_product_simple(self, main_product: Dict) -> Dict:
-        """Simple method to create fictional product"""
+        """Simple method to create fictional product - reused for products with the same fingerprint"""
+        key = self._fictional_cache_key(main_product)
+        if key in self._fictional_cache:
+            self._fictional_cache.move_to_end(key)
+            return copy.deepcopy(self._fictional_cache[key])
+        
         try:
             result = self.run_with_json_output(main_product)
             if result["success"] and result["output"]:
                 output = result["output"]
                 if isinstance(output, dict) and "fictional_product" in output:
-                    return output["fictional_product"]
-                return output
+                    output = output["fictional_product"]
+                return self._remember_fictional(key, output)
         except Exception as e:
             print(f"Error creating fictional product: {e}")
         
-        # Return fallback
-        fallback = json.loads(self._generate_fallback_fictional_product(main_product))
-        return fallback.get("fictional_product", {})
+        # Return fallback (not cached, so the next call retries Gemini)
+        return _fallback_fictional_product()
+    
+    async def acreate_fictional_product_simple(self, main_product: Dict) -> Dict:
+        """Async version of create_fictional_product_simple"""
+        key = self._fictional_cache_key(main_product)
+        if key in self._fictional_cache:
+            self._fictional_cache.move_to_end(key)
+            return copy.deepcopy(self._fictional_cache[key])
+        
+        try:
+            result = await self.arun_with_json_output(main_product)
+            if result["success"] and result["output"]:
+                output = result["output"]
+                if isinstance(output, dict) and "fictional_product" in output:
+                    output = output["fictional_product"]
+                return self._remember_fictional(key, output)
+        except Exception as e:
+            print(f"Error creating fictional product: {e}")
+        
+        return _fallback_fictional_product()
+    
+    async def create_many(self, products: List[Dict], max_parallel: int = MAX_PARALLEL_REQUESTS) -> List[Dict]:
+        """Create a fictional counterpart and comparison page for every product concurrently
+        
+        At most max_parallel Gemini requests are in flight at once. Returns one
+        {"fictional_product": {...}, "comparison_page": {...}} dict per product, in order.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def compare(product):
+            async with semaphore:
+                fictional_product = await self.acreate_fictional_product_simple(product)
+            async with semaphore:
+                comparison_page = await self.acreate_comparison_simple(product, fictional_product)
+            return {"fictional_product": fictional_product, "comparison_page": comparison_page}
+        
+        return list(await asyncio.gather(*[compare(product) for product in products]))
+    
+    def _comparison_cache_key(self, product_a: Dict, product_b: Dict = None) -> str:
+        """Content hash of the products being compared"""
+        return hashlib.blake2b(serialize_input([product_a, product_b]).encode()).hexdigest()
+    
+    def _remember_comparison(self, key: str, comparison: Dict) -> Dict:
+        """Store a comparison page in the LRU, evicting the oldest entry when full
+        
+        The cache keeps its own copy and hits return copies, so callers may mutate results.
+        """
+        self._comparison_cache[key] = copy.deepcopy(comparison)
+        self._comparison_cache.move_to_end(key)
+        if len(self._comparison_cache) > COMPARISON_CACHE_SIZE:
+            self._comparison_cache.popitem(last=False)
+        return comparison
     
     def create_comparison_simple(self, product_a: Dict, product_b: Dict = None) -> Dict:
-        """Simple method to create comparison"""
+        """Simple method to create comparison - reuses the last result for unchanged products"""
+        key = self._comparison_cache_key(product_a, product_b)
+        if key in self._comparison_cache:
+            self._comparison_cache.move_to_end(key)
+            return copy.deepcopy(self._comparison_cache[key])
+        
+        comparison = self._create_comparison(product_a, product_b)
+        if comparison is not None:
+            return self._remember_comparison(key, comparison)
+        
+        # Return fallback (not cached, so the next call retries Gemini)
+        if not product_b:
+            product_b = self.create_fictional_product_simple(product_a)
+        return self._fallback_comparison_page(product_a, product_b)
+    
+    def _create_comparison(self, product_a: Dict, product_b: Dict = None) -> Optional[Dict]:
+        """Create a comparison page with the LLM, or None when it produced nothing usable"""
         try:
             input_data = {"main_product": product_a}
             if product_b:
@@ -437,8 +679,37 @@ Both products are well-formulated and effective within their respective categori
         except Exception as e:
             print(f"Error creating comparison: {e}")
         
-        # Return fallback
+        return None
+    
+    async def acreate_comparison_simple(self, product_a: Dict, product_b: Dict = None) -> Dict:
+        """Async version of create_comparison_simple"""
+        key = self._comparison_cache_key(product_a, product_b)
+        if key in self._comparison_cache:
+            self._comparison_cache.move_to_end(key)
+            return copy.deepcopy(self._comparison_cache[key])
+        
+        comparison = await self._acreate_comparison(product_a, product_b)
+        if comparison is not None:
+            return self._remember_comparison(key, comparison)
+        
         if not product_b:
-            product_b = self.create_fictional_product_simple(product_a)
-        fallback = json.loads(self._generate_fallback_comparison(product_a, product_b))
-        return fallback.get("comparison_page", {})
\ No newline at end of file
+            product_b = await self.acreate_fictional_product_simple(product_a)
+        return self._fallback_comparison_page(product_a, product_b)
+    
+    async def _acreate_comparison(self, product_a: Dict, product_b: Dict = None) -> Optional[Dict]:
+        """Async version of _create_comparison"""
+        try:
+            input_data = {"main_product": product_a}
+            if product_b:
+                input_data["fictional_product"] = product_b
+            
+            result = await self.arun_with_json_output(input_data)
+            if result["success"] and result["output"]:
+                output = result["output"]
+                if isinstance(output, dict) and "comparison_page" in output:
+                    return output["comparison_page"]
+                return output
+        except Exception as e:
+            print(f"Error creating comparison: {e}")
+        
+        return None
@@ -1,6 +1,5 @@
 from typing import Dict, Any, List
 from langchain.tools import Tool
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 import json
@@ -10,16 +9,75 @@ from src.agents.base_agent import BaseAgent
 from src.core.models import GeneratedQuestion, QuestionCategory
 
 
+# Precompiled patterns for pulling JSON out of free-form Gemini responses
+_JSON_ARRAY_RE = re.compile(r'(\[\s*\{.*\}\s*\])', re.DOTALL)
+_QUESTIONS_OBJECT_RE = re.compile(r'(\{\s*"questions".*?\})', re.DOTALL)
+
+
+# (question builder, category, priority) rows for template questions; builders take the product name
+# and are f-string lambdas so no format string is parsed per call
+_FALLBACK_QUESTION_TEMPLATES = (
+    (lambda name: f"What is {name}?", "informational", 1),
+    (lambda name: f"How do I use {name}?", "usage", 1),
+    (lambda name: f"Are there any side effects of {name}?", "safety", 1),
+    (lambda name: f"Who should use {name}?", "safety", 2),
+    (lambda name: f"Can I use {name} with other skincare products?", "usage", 2),
+    (lambda name: f"How long does it take to see results with {name}?", "effectiveness", 2),
+    (lambda name: f"What are the key ingredients in {name}?", "ingredient", 1),
+    (lambda name: f"Is {name} worth the price?", "purchase", 3),
+    (lambda name: f"Where can I buy {name}?", "purchase", 3),
+    (lambda name: f"How does {name} compare to similar products?", "comparison", 2),
+    (lambda name: f"Can {name} help with dark spots?", "effectiveness", 2),
+    (lambda name: f"Is {name} suitable for sensitive skin?", "safety", 2),
+    (lambda name: f"When is the best time to use {name}?", "usage", 3),
+    (lambda name: f"How should I store {name}?", "usage", 4),
+    (lambda name: f"What makes {name} different from other serums?", "comparison", 3),
+)
+
+_MISSING_QUESTION_TEMPLATES = (
+    (lambda name: f"What is the concentration of active ingredients in {name}?", "informational", 4),
+    (lambda name: f"Can {name} be used during pregnancy?", "safety", 4),
+    (lambda name: f"Does {name} expire?", "safety", 4),
+    (lambda name: f"How much product should I use per application?", "usage", 3),
+    (lambda name: f"Are there any ingredients in {name} that might cause allergies?", "safety", 3),
+)
+
+
+def _integral_priority(value: Any) -> int:
+    """Validate an LLM-supplied priority: an integer (or integral float/numeric string) in 1-5"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"priority {value!r} is not an integer")
+    if not 1 <= value <= 5:
+        raise ValueError(f"priority {value} out of range 1-5")
+    return value
+
 class QuestionGeneratorAgent(BaseAgent):
     """Agent for generating categorized questions about products - Updated for Gemini"""
     
+    # Gemini structured-output schema for the question list
+    response_schema = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "question": {"type": "string"},
+                "category": {"type": "string", "enum": [c.value for c in QuestionCategory]},
+                "priority": {"type": "integer"}
+            },
+            "required": ["question", "category", "priority"]
+        }
+    }
+    
     def __init__(self, llm=None):
         super().__init__(
             name="question_generator",
             description="Generates categorized questions about skincare products",
             llm=llm
         )
-        self.json_parser = JsonOutputParser()
     
     def _setup_tools(self):
         """Setup question generation tools - Simplified for Gemini"""
@@ -83,30 +141,31 @@ class QuestionGeneratorAgent(BaseAgent):
                     # Fallback: generate simple questions
                     questions_data = self._generate_fallback_questions(data)
                 
-                # Format and validate
-                questions = []
-                for i, q in enumerate(questions_data[:15]):  # Ensure max 15
+                # Format and validate column-wise, then emit the dicts directly
+                texts, cats, prios = [], [], []
+                for q in questions_data[:15]:  # Ensure max 15
                     try:
                         if isinstance(q, str):
                             # Handle string-only questions
-                            question = GeneratedQuestion(
-                                id=f"q{i+1}",
-                                question=q,
-                                category=QuestionCategory.INFORMATIONAL,
-                                priority=3
-                            )
+                            text, category, priority = q, QuestionCategory.INFORMATIONAL, 3
                         else:
                             # Handle dict questions
-                            question = GeneratedQuestion(
-                                id=f"q{i+1}",
-                                question=q.get("question", str(q)),
-                                category=QuestionCategory(q.get("category", "informational").lower()),
-                                priority=q.get("priority", 3)
-                            )
-                        questions.append(question.model_dump())
+                            text = q.get("question")
+                            if not isinstance(text, str):
+                                raise ValueError(f"question text {text!r} is not a string")
+                            category = QuestionCategory(q.get("category", "informational").lower())
+                            priority = _integral_priority(q.get("priority", 3))
                     except Exception as e:
                         print(f"Error parsing question {q}: {e}")
                         continue
+                    texts.append(text)
+                    cats.append(category)
+                    prios.append(priority)
+                
+                questions = [
+                    {"question": t, "category": c, "priority": p}
+                    for t, c, p in zip(texts, cats, prios)
+                ]
                 
                 # Ensure we have exactly 15 questions
                 if len(questions) < 15:
@@ -115,7 +174,7 @@ class QuestionGeneratorAgent(BaseAgent):
                 return json.dumps({
                     "questions": questions[:15],
                     "total_generated": len(questions),
-                    "categories_covered": list(set([q.get("category") for q in questions if q.get("category")]))
+                    "categories_covered": list({category for q in questions if (category := q.get("category"))})
                 }, indent=2)
                 
             except Exception as e:
@@ -143,12 +202,12 @@ class QuestionGeneratorAgent(BaseAgent):
             return response
         except:
             # Try to find JSON in the text
-            json_match = re.search(r'(\[\s*\{.*\}\s*\])', response, re.DOTALL)
+            json_match = _JSON_ARRAY_RE.search(response)
             if json_match:
                 return json_match.group(1)
             
             # Try object format
-            json_match = re.search(r'(\{\s*"questions".*?\})', response, re.DOTALL)
+            json_match = _QUESTIONS_OBJECT_RE.search(response)
             if json_match:
                 return json_match.group(1)
             
@@ -156,42 +215,26 @@ class QuestionGeneratorAgent(BaseAgent):
     
     def _generate_fallback_questions(self, product_data: Dict) -> List[Dict]:
         """Generate fallback questions if Gemini fails"""
-        base_questions = [
-            {"question": f"What is {product_data.get('name', 'this product')}?", "category": "informational", "priority": 1},
-            {"question": f"How do I use {product_data.get('name', 'this product')}?", "category": "usage", "priority": 1},
-            {"question": f"Are there any side effects of {product_data.get('name', 'this product')}?", "category": "safety", "priority": 1},
-            {"question": f"Who should use {product_data.get('name', 'this product')}?", "category": "safety", "priority": 2},
-            {"question": f"Can I use {product_data.get('name', 'this product')} with other skincare products?", "category": "usage", "priority": 2},
-            {"question": f"How long does it take to see results with {product_data.get('name', 'this product')}?", "category": "effectiveness", "priority": 2},
-            {"question": f"What are the key ingredients in {product_data.get('name', 'this product')}?", "category": "ingredient", "priority": 1},
-            {"question": f"Is {product_data.get('name', 'this product')} worth the price?", "category": "purchase", "priority": 3},
-            {"question": f"Where can I buy {product_data.get('name', 'this product')}?", "category": "purchase", "priority": 3},
-            {"question": f"How does {product_data.get('name', 'this product')} compare to similar products?", "category": "comparison", "priority": 2},
-            {"question": f"Can {product_data.get('name', 'this product')} help with dark spots?", "category": "effectiveness", "priority": 2},
-            {"question": f"Is {product_data.get('name', 'this product')} suitable for sensitive skin?", "category": "safety", "priority": 2},
-            {"question": f"When is the best time to use {product_data.get('name', 'this product')}?", "category": "usage", "priority": 3},
-            {"question": f"How should I store {product_data.get('name', 'this product')}?", "category": "usage", "priority": 4},
-            {"question": f"What makes {product_data.get('name', 'this product')} different from other serums?", "category": "comparison", "priority": 3},
+        name = product_data.get('name', 'this product')
+        return [
+            {"question": build(name), "category": category, "priority": priority}
+            for build, category, priority in _FALLBACK_QUESTION_TEMPLATES
         ]
-        return base_questions
     
     def _generate_missing_questions(self, product_data: Dict, count: int) -> List[Dict]:
         """Generate additional questions if we don't have enough"""
-        additional = [
-            {"question": f"What is the concentration of active ingredients in {product_data.get('name', 'this product')}?", "category": "informational", "priority": 4},
-            {"question": f"Can {product_data.get('name', 'this product')} be used during pregnancy?", "category": "safety", "priority": 4},
-            {"question": f"Does {product_data.get('name', 'this product')} expire?", "category": "safety", "priority": 4},
-            {"question": f"How much product should I use per application?", "category": "usage", "priority": 3},
-            {"question": f"Are there any ingredients in {product_data.get('name', 'this product')} that might cause allergies?", "category": "safety", "priority": 3},
+        name = product_data.get('name', 'this product')
+        return [
+            {"question": build(name), "category": category, "priority": priority}
+            for build, category, priority in _MISSING_QUESTION_TEMPLATES[:count]
         ]
-        return additional[:count]
     
     def _setup_agent(self):
         """Setup question generator agent - Simplified for Gemini"""
         # Use the parent class's simple chain approach
         self.agent_executor = self._create_agent_executor(
             tools=self.tools,
-            system_prompt=self.get_system_prompt()
+            system_prompt=self.system_prompt
         )
     
     def get_system_prompt(self) -> str:
@@ -227,23 +270,7 @@ class QuestionGeneratorAgent(BaseAgent):
             result = self.run_with_json_output(product_data)
             
             if result["success"] and result["output"]:
-                questions_data = result["output"]
-                if isinstance(questions_data, dict) and "questions" in questions_data:
-                    questions_data = questions_data["questions"]
-                
-                questions = []
-                for i, q in enumerate(questions_data[:15]):
-                    try:
-                        questions.append(GeneratedQuestion(
-                            id=f"q{i+1}",
-                            question=q.get("question", str(q)),
-                            category=QuestionCategory(q.get("category", "informational").lower()),
-                            priority=q.get("priority", 3)
-                        ))
-                    except:
-                        continue
-                
-                return questions[:15]
+                return self._questions_from_output(result["output"])
             
         except Exception as e:
             print(f"Error in generate_questions_simple: {e}")
@@ -251,14 +278,46 @@ class QuestionGeneratorAgent(BaseAgent):
         # Fallback to template questions
         return self._generate_template_questions(product_data)
     
+    async def agenerate_questions_simple(self, product_data: Dict) -> List[GeneratedQuestion]:
+        """Async version of generate_questions_simple"""
+        try:
+            result = await self.arun_with_json_output(product_data)
+            
+            if result["success"] and result["output"]:
+                return self._questions_from_output(result["output"])
+            
+        except Exception as e:
+            print(f"Error in agenerate_questions_simple: {e}")
+        
+        return self._generate_template_questions(product_data)
+    
+    def _questions_from_output(self, questions_data) -> List[GeneratedQuestion]:
+        """Convert LLM JSON output into validated GeneratedQuestion models"""
+        if isinstance(questions_data, dict) and "questions" in questions_data:
+            questions_data = questions_data["questions"]
+        
+        questions = []
+        for i, q in enumerate(questions_data[:15]):
+            try:
+                questions.append(GeneratedQuestion(
+                    id=f"q{i+1}",
+                    question=q.get("question", str(q)),
+                    category=QuestionCategory(q.get("category", "informational").lower()),
+                    priority=q.get("priority", 3)
+                ))
+            except:
+                continue
+        
+        return questions[:15]
+    
     def _generate_template_questions(self, product_data: Dict) -> List[GeneratedQuestion]:
         """Generate template-based questions as last resort"""
         template_questions = []
         fallback_data = self._generate_fallback_questions(product_data)
         
-        for i, q in enumerate(fallback_data[:15]):
-            template_questions.append(GeneratedQuestion(
-                id=f"q{i+1}",
+        # Template data is trusted, so skip per-question validation
+        for q in fallback_data[:15]:
+            template_questions.append(GeneratedQuestion.model_construct(
                 question=q["question"],
                 category=QuestionCategory(q["category"]),
                 priority=q["priority"]
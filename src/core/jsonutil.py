@@ -0,0 +1,51 @@
+"""
+JSON encoding and decoding, using orjson's C implementation when it is installed
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(text) -> Any:
+    """Parse JSON text (str or bytes)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumpb(obj: Any, indent: bool = False, sort_keys: bool = False,
+          default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj as UTF-8 JSON bytes, compact unless indent=True (2 spaces)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=_orjson_option(indent, sort_keys))
+    return _stdlib_dumps(obj, indent, sort_keys, default).encode()
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False,
+          default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize obj as JSON text, compact unless indent=True (2 spaces)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=_orjson_option(indent, sort_keys)).decode()
+    return _stdlib_dumps(obj, indent, sort_keys, default)
+
+
+def _orjson_option(indent: bool, sort_keys: bool) -> int:
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return option
+
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool, default) -> str:
+    # Same layout as orjson: non-ASCII kept as-is, no spaces in compact output
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, default=default, ensure_ascii=False)
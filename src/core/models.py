@@ -1,10 +1,15 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
 class ProductData(BaseModel):
     """Product data model with validation"""
+    # Never mutated after validation. Extra keys are ignored rather than forbidden: LLM
+    # extraction and user input routinely carry fields beyond these, and rejecting them
+    # would turn a usable record into a fallback
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Product name")
     concentration: str = Field(..., description="Active ingredient concentration")
     skin_type: List[str] = Field(..., description="Suitable skin types")
@@ -35,6 +40,9 @@ class GeneratedQuestion(BaseModel):
 
 class FAQItem(BaseModel):
     """FAQ item model"""
+    # Extra keys (e.g. an answer's "id" echoed by the model) are ignored, not forbidden
+    model_config = ConfigDict(frozen=True)
+    
     question: str = Field(..., description="FAQ question")
     answer: str = Field(..., description="FAQ answer")
     category: str = Field(..., description="Question category")
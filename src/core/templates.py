@@ -1,12 +1,17 @@
+import functools
 from typing import Dict, Any, List
 from langchain.prompts import PromptTemplate, ChatPromptTemplate, SystemMessagePromptTemplate
 from langchain_core.prompts import HumanMessagePromptTemplate
 
 
 class ContentTemplates:
-    """LLM prompt templates for content generation"""
+    """LLM prompt templates for content generation
+    
+    Templates are immutable once built, so each getter builds its template once per process.
+    """
     
     @staticmethod
+    @functools.cache
     def get_question_generation_template() -> ChatPromptTemplate:
         """Template for generating categorized questions"""
         system_template = """You are a skincare expert and market researcher. 
@@ -39,6 +44,7 @@ class ContentTemplates:
         ])
     
     @staticmethod
+    @functools.cache
     def get_faq_generation_template() -> ChatPromptTemplate:
         """Template for generating FAQ answers"""
         system_template = """You are a skincare expert creating FAQ content.
@@ -51,7 +57,9 @@ class ContentTemplates:
         4. Do NOT add new information or claims
         5. Include relevant details from product data
         
-        Output Format: JSON list with 'question', 'answer', 'category', and 'tags' fields"""
+        6. Questions are numbered [0], [1], ...; answer every one and echo its number as 'id'
+        
+        Output Format: JSON list with 'id', 'question', 'answer', 'category', and 'tags' fields"""
         
         human_template = """Product Context:
         Product: {name}
@@ -71,6 +79,7 @@ class ContentTemplates:
         ])
     
     @staticmethod
+    @functools.cache
     def get_product_page_template() -> ChatPromptTemplate:
         """Template for generating product page content"""
         system_template = """You are a professional skincare copywriter creating product pages.
@@ -111,6 +120,7 @@ class ContentTemplates:
         ])
     
     @staticmethod
+    @functools.cache
     def get_comparison_template() -> ChatPromptTemplate:
         """Template for generating product comparison"""
         system_template = """You are a skincare analyst creating product comparisons.
@@ -156,6 +166,7 @@ class ContentTemplates:
         ])
     
     @staticmethod
+    @functools.cache
     def get_fictional_product_template() -> ChatPromptTemplate:
         """Template for creating fictional comparison product"""
         system_template = """Create a fictional skincare product for comparison purposes.
@@ -10,6 +10,7 @@ from src.core.models import (
     ProductPage, ComparisonPage, QuestionCategory
 )
 from src.core.templates import ContentTemplates
+from src.core.faq import faq_items_from_answers, placeholder_faq_item
 
 
 class ParseProductDataTool(BaseTool):
@@ -92,7 +93,7 @@ class GenerateQuestionsTool(BaseTool):
                 "success": True,
                 "questions": [q.model_dump() for q in questions[:num_questions]],
                 "count": len(questions),
-                "categories": list(set([q.category.value for q in questions]))
+                "categories": list({q.category.value for q in questions})
             }
             
         except Exception as e:
@@ -162,36 +163,16 @@ class GenerateFAQTool(BaseTool):
             # Select questions for FAQ
             selected_questions = questions[:num_faqs]
             
+            # All questions go out in one numbered prompt; answers come back tagged with the same id
             result = chain.invoke({
-                "questions": "\n".join([q.get("question", "") for q in selected_questions]),
+                "questions": "\n".join([f"[{i}] {q.get('question', '')}" for i, q in enumerate(selected_questions)]),
                 **product_data
             })
-            
-            # Create FAQ items
-            faq_items = []
-            for i, faq_data in enumerate(result[:num_faqs]):
-                try:
-                    # Use original question category
-                    original_category = selected_questions[i].get("category", "general")
-                    
-                    faq_item = FAQItem(
-                        question=selected_questions[i].get("question", ""),
-                        answer=faq_data.get("answer", ""),
-                        category=original_category,
-                        tags=faq_data.get("tags", [])
-                    )
-                    faq_items.append(faq_item)
-                except:
-                    continue
+            faq_items = faq_items_from_answers(selected_questions, result)
             
             # Ensure we have at least 5 FAQ items
             while len(faq_items) < 5:
-                faq_items.append(FAQItem(
-                    question="Sample question",
-                    answer="Sample answer based on product data",
-                    category="general",
-                    tags=["sample"]
-                ))
+                faq_items.append(placeholder_faq_item())
             
             return {
                 "success": True,
@@ -243,6 +224,27 @@ class GenerateProductPageTool(BaseTool):
             }
 
 
+# Default comparison points (aspect, flattened product key, verdict) used when the LLM returns too few
+_COMPARISON_PADDING = (
+    ("Price", "price", "Different price points for different markets"),
+    ("Ingredients", "ingredients", "Different formulations for different needs"),
+    ("Skin Type Suitability", "skin_type", "Targets different skin concerns"),
+    ("Benefits", "benefits", "Different primary benefits"),
+)
+
+
+def _flatten_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a product dict into the string fields used by the comparison template"""
+    return {
+        "name": product.get("name"),
+        "concentration": product.get("concentration"),
+        "skin_type": ", ".join(product.get("skin_type", [])),
+        "ingredients": ", ".join(product.get("key_ingredients", [])),
+        "benefits": ", ".join(product.get("benefits", [])),
+        "price": product.get("price")
+    }
+
+
 class GenerateComparisonTool(BaseTool):
     name = "generate_comparison"
     description = "Generate detailed product comparison using LLM"
@@ -261,20 +263,13 @@ class GenerateComparisonTool(BaseTool):
             template = ContentTemplates.get_comparison_template()
             chain = template | self.llm | JsonOutputParser()
             
+            # Flatten each product's list fields once and reuse them for the prompt and padding
+            product_a = _flatten_product(main_product)
+            product_b = _flatten_product(fictional_product)
+            
             result = chain.invoke({
-                "product_a_name": main_product.get("name"),
-                "product_a_concentration": main_product.get("concentration"),
-                "product_a_skin_type": ", ".join(main_product.get("skin_type", [])),
-                "product_a_ingredients": ", ".join(main_product.get("key_ingredients", [])),
-                "product_a_benefits": ", ".join(main_product.get("benefits", [])),
-                "product_a_price": main_product.get("price"),
-                
-                "product_b_name": fictional_product.get("name"),
-                "product_b_concentration": fictional_product.get("concentration"),
-                "product_b_skin_type": ", ".join(fictional_product.get("skin_type", [])),
-                "product_b_ingredients": ", ".join(fictional_product.get("key_ingredients", [])),
-                "product_b_benefits": ", ".join(fictional_product.get("benefits", [])),
-                "product_b_price": fictional_product.get("price")
+                **{f"product_a_{key}": value for key, value in product_a.items()},
+                **{f"product_b_{key}": value for key, value in product_b.items()}
             })
             
             # Create ComparisonPage model
@@ -284,29 +279,12 @@ class GenerateComparisonTool(BaseTool):
             if len(comparison_page.comparison_points) < 4:
                 comparison_page.comparison_points.extend([
                     {
-                        "aspect": "Price",
-                        "main_product": main_product.get("price"),
-                        "fictional_product": fictional_product.get("price"),
-                        "verdict": "Different price points for different markets"
-                    },
-                    {
-                        "aspect": "Ingredients",
-                        "main_product": ", ".join(main_product.get("key_ingredients", [])),
-                        "fictional_product": ", ".join(fictional_product.get("key_ingredients", [])),
-                        "verdict": "Different formulations for different needs"
-                    },
-                    {
-                        "aspect": "Skin Type Suitability",
-                        "main_product": ", ".join(main_product.get("skin_type", [])),
-                        "fictional_product": ", ".join(fictional_product.get("skin_type", [])),
-                        "verdict": "Targets different skin concerns"
-                    },
-                    {
-                        "aspect": "Benefits",
-                        "main_product": ", ".join(main_product.get("benefits", [])),
-                        "fictional_product": ", ".join(fictional_product.get("benefits", [])),
-                        "verdict": "Different primary benefits"
+                        "aspect": aspect,
+                        "main_product": product_a[key],
+                        "fictional_product": product_b[key],
+                        "verdict": verdict
                     }
+                    for aspect, key, verdict in _COMPARISON_PADDING
                 ])
             
             return {
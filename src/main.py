@@ -4,6 +4,8 @@ Main entry point for LangChain Multi-Agent Content Generation System
 Now using Google Gemini API for 100% LLM-driven content generation
 """
 
+import asyncio
+import importlib.metadata
 import json
 import os
 import sys
@@ -32,6 +34,7 @@ def verify_gemini_connection():
         # Try different models
         models_to_try = ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-pro"]
         
+        probe_config = genai.types.GenerationConfig(max_output_tokens=5)
         for model in models_to_try:
             try:
                 gemini_model = genai.GenerativeModel(model)
@@ -39,9 +42,7 @@ def verify_gemini_connection():
                 # Make a simple test call
                 response = gemini_model.generate_content(
                     "Say 'Hello' in one word.",
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=5
-                    )
+                    generation_config=probe_config
                 )
                 
                 if response.text:
@@ -90,17 +91,20 @@ def check_dependencies():
         'langgraph'
     ]
     
-    missing = []
-    for package in required_packages:
-        try:
-            if package == 'google.generativeai':
-                __import__('google.generativeai')
-            else:
-                __import__(package.replace('-', '_'))
-        except ImportError:
-            missing.append(package)
+    # Import names whose distribution name differs
+    distribution_names = {'google.generativeai': 'google-generativeai'}
     
-    return missing
+    # One pass over installed distribution metadata - no module code is executed
+    installed = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.add(name.lower().replace('-', '_'))
+    
+    return [
+        package for package in required_packages
+        if distribution_names.get(package, package).lower().replace('-', '_') not in installed
+    ]
 
 def main():
     """Main execution function - ensures Gemini LLM-driven generation"""
@@ -344,21 +348,27 @@ def run_simplified_workflow(product_data):
         content_agent = ContentCreatorAgent(config.llm)
         comparator_agent = ProductComparatorAgent(config.llm)
         
-        # Generate questions
-        print("  Generating questions...")
-        questions = question_agent.generate_questions_simple(product_data)
-        
-        # Create FAQ
-        print("  Creating FAQ...")
-        faq_items = content_agent.create_faq_simple(questions, product_data)
-        
-        # Create product page
-        print("  Creating product page...")
-        product_page = content_agent.create_product_page_simple(product_data)
-        
-        # Create comparison
-        print("  Creating comparison...")
-        comparison = comparator_agent.create_comparison_simple(product_data)
+        # Only the FAQ depends on another step (the generated questions), so
+        # questions -> FAQ runs as one chain alongside the product page and comparison
+        print("  Generating questions, FAQ, product page and comparison...")
+        
+        async def questions_then_faq():
+            questions = await question_agent.agenerate_questions_simple(product_data)
+            return await content_agent.acreate_faq_simple(questions, product_data)
+        
+        async def run_independent_agents():
+            # Python 3.12+: steps that finish without blocking (cache hits, fallbacks)
+            # complete inline instead of waiting for an event-loop turn
+            loop = asyncio.get_running_loop()
+            if hasattr(asyncio, "eager_task_factory") and loop.get_task_factory() is None:
+                loop.set_task_factory(asyncio.eager_task_factory)
+            return await asyncio.gather(
+                questions_then_faq(),
+                content_agent.acreate_product_page_simple(product_data),
+                comparator_agent.acreate_comparison_simple(product_data)
+            )
+        
+        faq_items, product_page, comparison = asyncio.run(run_independent_agents())
         
         # Save outputs
         print("  Saving outputs...")
@@ -1,5 +1,4 @@
 from typing import TypedDict, Annotated, List, Optional, Dict, Any
-from pydantic import BaseModel
 from langchain_core.messages import BaseMessage
 
 
@@ -7,8 +6,13 @@ from langchain_core.messages import BaseMessage
 try:
     from langgraph.graph import add_messages
 except ImportError:
-    # Fallback for older versions
-    from langgraph.graph.message import add_messages
+    try:
+        # Fallback for older versions
+        from langgraph.graph.message import add_messages
+    except ImportError:
+        # langgraph not installed - the simplified workflow only needs list concatenation
+        def add_messages(left: List[Any], right: List[Any]) -> List[Any]:
+            return left + right
 
 
 class ContentGenerationState(TypedDict):
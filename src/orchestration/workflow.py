@@ -1,6 +1,7 @@
 from typing import Dict, Any, List, Optional
-import json
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from src.config import Config
 
@@ -39,49 +40,17 @@ except ImportError:
         def load(self, state_id):
             return self.states.get(state_id)
 
-# Define state type since we can't import it if langgraph is missing
-if LANGGRAPH_AVAILABLE:
-    try:
-        from langgraph.graph.message import add_messages
-        from typing import TypedDict, Annotated
-        from langchain_core.messages import BaseMessage
-        
-        class ContentGenerationState(TypedDict):
-            messages: Annotated[List[BaseMessage], add_messages]
-            raw_product_data: Optional[Dict[str, Any]]
-            parsed_product_data: Optional[Dict[str, Any]]
-            generated_questions: Optional[List[Dict[str, Any]]]
-            fictional_product: Optional[Dict[str, Any]]
-            faq_content: Optional[List[Dict[str, Any]]]
-            product_page_content: Optional[Dict[str, Any]]
-            comparison_content: Optional[Dict[str, Any]]
-            errors: List[str]
-            current_step: str
-            completed_steps: List[str]
-            output_files: List[str]
-            
-    except ImportError:
-        # Fallback for newer langgraph versions
-        from langgraph.graph import add_messages
-        from typing import TypedDict, Annotated
-        from langchain_core.messages import BaseMessage
-        
-        class ContentGenerationState(TypedDict):
-            messages: Annotated[List[BaseMessage], add_messages]
-            raw_product_data: Optional[Dict[str, Any]]
-            parsed_product_data: Optional[Dict[str, Any]]
-            generated_questions: Optional[List[Dict[str, Any]]]
-            fictional_product: Optional[Dict[str, Any]]
-            faq_content: Optional[List[Dict[str, Any]]]
-            product_page_content: Optional[Dict[str, Any]]
-            comparison_content: Optional[Dict[str, Any]]
-            errors: List[str]
-            current_step: str
-            completed_steps: List[str]
-            output_files: List[str]
-else:
-    # Define simple state dictionary if langgraph is not available
-    ContentGenerationState = dict
+from src.orchestration.state import ContentGenerationState
+
+from src.core.jsonutil import dumpb
+
+
+def _dump_output(obj: Any) -> bytes:
+    """Serialize an output file as indented UTF-8 JSON"""
+    return dumpb(obj, indent=True)
+
+# State lists every node appends to; parallel branches collect them separately and are merged in node order
+_BRANCH_LIST_KEYS = ("messages", "errors", "completed_steps")
 
 
 class ContentGenerationWorkflow:
@@ -91,6 +60,10 @@ class ContentGenerationWorkflow:
         self.config = Config()
         self.llm = self.config.llm
         
+        # Created once here rather than on every output compilation
+        self.output_dir = Path("outputs")
+        self.output_dir.mkdir(exist_ok=True)
+        
         # Dynamically import tools to avoid circular imports
         self._setup_tools()
         
@@ -195,7 +168,7 @@ class ContentGenerationWorkflow:
             "output_files": []
         }
         
-        # Execute steps sequentially
+        # Execute the DAG layer by layer - nodes within a layer only depend on earlier layers
         try:
             # Step 1: Parse product
             state = self._parse_product_node(state)
@@ -203,27 +176,28 @@ class ContentGenerationWorkflow:
             if state.get("parsed_product_data"):
                 print(f"  ✅ Parsed: {state['parsed_product_data']['name']}")
                 
-                # Step 2: Generate questions
-                state = self._generate_questions_node(state)
+                # Steps 2, 3, 5: questions, fictional product and product page only need the parsed product
+                state = self._run_parallel_nodes(state, [
+                    self._generate_questions_node,
+                    self._create_fictional_product_node,
+                    self._generate_product_page_node
+                ])
                 print(f"  ✅ Generated {len(state.get('generated_questions', []))} questions")
-                
-                # Step 3: Create fictional product
-                state = self._create_fictional_product_node(state)
-                fictional_name = state.get('fictional_product', {}).get('name', 'fictional product')
+                fictional_name = (state.get('fictional_product') or {}).get('name', 'fictional product')
                 print(f"  ✅ Created fictional product: {fictional_name}")
+                print("  ✅ Generated product page")
                 
-                # Step 4: Generate FAQ
+                # Steps 4, 6: FAQ needs the questions, comparison needs the fictional product
+                dependent_nodes = []
+                if state.get("generated_questions"):
+                    dependent_nodes.append(self._generate_faq_node)
+                if state.get("fictional_product"):
+                    dependent_nodes.append(self._generate_comparison_node)
+                if dependent_nodes:
+                    state = self._run_parallel_nodes(state, dependent_nodes)
                 if state.get("generated_questions"):
-                    state = self._generate_faq_node(state)
                     print(f"  ✅ Generated {len(state.get('faq_content', []))} FAQ items")
-                
-                # Step 5: Generate product page
-                state = self._generate_product_page_node(state)
-                print("  ✅ Generated product page")
-                
-                # Step 6: Generate comparison
                 if state.get("fictional_product"):
-                    state = self._generate_comparison_node(state)
                     print("  ✅ Generated comparison")
                 
                 # Step 7: Compile outputs
@@ -247,6 +221,40 @@ class ContentGenerationWorkflow:
             "messages": state.get("messages", [])
         }
     
+    def _run_parallel_nodes(self, state, nodes):
+        """Run independent nodes concurrently and merge their updates into state
+        
+        Each node gets a shallow copy of state with empty message/error/step lists, so
+        concurrent nodes never touch the same list; the keys a node replaced are copied back.
+        """
+        if len(nodes) == 1:
+            return nodes[0](state)
+        
+        snapshot = dict(state)
+        branches = []
+        for _ in nodes:
+            branch = dict(state)
+            for key in _BRANCH_LIST_KEYS:
+                branch[key] = []
+            branches.append(branch)
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            futures = {executor.submit(node, branch): node for node, branch in zip(nodes, branches)}
+            # Report nodes in the order they actually finish; merge below in node order
+            for future in as_completed(futures):
+                step = futures[future].__name__.strip("_").replace("_node", "")
+                print(f"    ⏱ {step} finished after {time.perf_counter() - started:.1f}s")
+            results = [future.result() for future in futures]
+        
+        for result in results:
+            for key in _BRANCH_LIST_KEYS:
+                state[key] = state.get(key, []) + result.get(key, [])
+            for key, value in result.items():
+                if key not in _BRANCH_LIST_KEYS and value is not snapshot.get(key):
+                    state[key] = value
+        return state
+    
     # Node methods (updated for Gemini compatibility)
     def _parse_product_node(self, state):
         """Parse and validate product data"""
@@ -303,7 +311,7 @@ class ContentGenerationWorkflow:
                     questions = question_agent.generate_questions_simple(product)
                     result = {
                         "success": True,
-                        "questions": [q.model_dump() for q in questions] if hasattr(questions[0], 'model_dump') else questions,
+                        "questions": [dict(q.__dict__) for q in questions] if hasattr(questions[0], 'model_dump') else questions,
                         "method": "gemini_agent",
                         "categories": ["informational", "safety", "usage", "purchase", "comparison", "ingredient", "effectiveness"]
                     }
@@ -450,20 +458,29 @@ class ContentGenerationWorkflow:
                     }
                 except:
                     # Simple FAQ generation
+                    # Product-derived answer text is the same for every question, so build it once
+                    product = state['parsed_product_data']
+                    benefits = ', '.join(product['benefits'])
+                    what_is_answer = f"{product['name']} is a {product['concentration']} serum formulated for {', '.join(product['skin_type'])} skin. It provides {', '.join(product['benefits'][:2])} through its key ingredients: {', '.join(product['key_ingredients'])}."
+                    usage_answer = f"{product['how_to_use']}. For best results, use consistently as part of your daily skincare routine."
+                    safety_answer = f"{product['side_effects']}. Always patch test before first use. Discontinue if irritation persists."
+                    benefits_answer = f"The key benefits are: {benefits}. Regular use helps achieve these results."
+                    
                     faq_items = []
                     for i, q in enumerate(state.get("generated_questions", [])[:5]):
                         question_text = q.get("question", f"Question {i+1}")
                         category = q.get("category", "general")
+                        question_lower = question_text.lower()
                         
                         # Create answer based on question type
-                        if "what is" in question_text.lower():
-                            answer = f"{state['parsed_product_data']['name']} is a {state['parsed_product_data']['concentration']} serum formulated for {', '.join(state['parsed_product_data']['skin_type'])} skin. It provides {', '.join(state['parsed_product_data']['benefits'][:2])} through its key ingredients: {', '.join(state['parsed_product_data']['key_ingredients'])}."
-                        elif "how do i use" in question_text.lower():
-                            answer = f"{state['parsed_product_data']['how_to_use']}. For best results, use consistently as part of your daily skincare routine."
-                        elif "safe" in question_text.lower():
-                            answer = f"{state['parsed_product_data']['side_effects']}. Always patch test before first use. Discontinue if irritation persists."
-                        elif "benefits" in question_text.lower():
-                            answer = f"The key benefits are: {', '.join(state['parsed_product_data']['benefits'])}. Regular use helps achieve these results."
+                        if "what is" in question_lower:
+                            answer = what_is_answer
+                        elif "how do i use" in question_lower:
+                            answer = usage_answer
+                        elif "safe" in question_lower:
+                            answer = safety_answer
+                        elif "benefits" in question_lower:
+                            answer = benefits_answer
                         else:
                             answer = f"This product is designed to address various skin concerns through its advanced formulation. Consult the product documentation or a dermatologist for specific questions."
                         
@@ -681,36 +698,45 @@ class ContentGenerationWorkflow:
     def _compile_outputs_node(self, state):
         """Compile all outputs to JSON files"""
         try:
-            os.makedirs("outputs", exist_ok=True)
-            output_files = []
+            # Read each generated section once
+            faq_content = state.get("faq_content", [])
+            product_page_content = state.get("product_page_content")
+            comparison_content = state.get("comparison_content")
+            
+            # (file name, payload, label) for every output that was generated
+            outputs = []
             
             # Save FAQ
-            if state.get("faq_content"):
+            if faq_content:
                 faq_output = {
                     "product": state["parsed_product_data"]["name"],
-                    "faq_items": state["faq_content"],
+                    "faq_items": faq_content,
                     "generated_at": "now",
                     "source": "gemini_llm",
                     "model": "gemini-1.5-flash"
                 }
-                with open("outputs/faq.json", "w") as f:
-                    json.dump(faq_output, f, indent=2)
-                output_files.append("faq.json")
-                print(f"    Saved FAQ to outputs/faq.json")
+                outputs.append(("faq.json", faq_output, "FAQ"))
             
             # Save product page
-            if state.get("product_page_content"):
-                with open("outputs/product_page.json", "w") as f:
-                    json.dump(state["product_page_content"], f, indent=2)
-                output_files.append("product_page.json")
-                print(f"    Saved product page to outputs/product_page.json")
+            if product_page_content:
+                outputs.append(("product_page.json", product_page_content, "product page"))
             
             # Save comparison
-            if state.get("comparison_content"):
-                with open("outputs/comparison_page.json", "w") as f:
-                    json.dump(state["comparison_content"], f, indent=2)
-                output_files.append("comparison_page.json")
-                print(f"    Saved comparison to outputs/comparison_page.json")
+            if comparison_content:
+                outputs.append(("comparison_page.json", comparison_content, "comparison"))
+            
+            # The files are independent, so serialize and write them concurrently
+            if outputs:
+                with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+                    list(executor.map(
+                        lambda output: (self.output_dir / output[0]).write_bytes(_dump_output(output[1])),
+                        outputs
+                    ))
+            
+            output_files = []
+            for filename, _, label in outputs:
+                output_files.append(filename)
+                print(f"    Saved {label} to {self.output_dir / filename}")
             
             state["output_files"] = output_files
             state["current_step"] = "compile_outputs"
@@ -720,7 +746,7 @@ class ContentGenerationWorkflow:
             🎉 Content Generation Complete with Gemini!
             
             ✅ Generated Outputs:
-            • FAQ: {len(state.get('faq_content', []))} items
+            • FAQ: {len(faq_content)} items
             • Product Page: Complete with all sections
             • Comparison: Detailed product comparison
             
@@ -0,0 +1,246 @@
+import asyncio
+import datetime
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agents import base_agent
+from src.agents.question_generator import QuestionGeneratorAgent
+
+
+class TestBaseAgent:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        return QuestionGeneratorAgent()
+
+    def test_disk_response_round_trip(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setattr(base_agent, "RESPONSE_CACHE_DIR", str(tmp_path))
+
+        agent._write_disk_response("key", '{"answer": "cached"}')
+
+        assert agent._read_disk_response("key") == '{"answer": "cached"}'
+        assert agent._read_disk_response("missing") is None
+        assert [p.name for p in tmp_path.iterdir()] == ["key.txt"]
+
+    def test_concurrent_disk_writes_use_separate_temp_files(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setattr(base_agent, "RESPONSE_CACHE_DIR", str(tmp_path))
+        temp_paths = []
+        replace = base_agent.os.replace
+
+        def recording_replace(src, dst):
+            temp_paths.append(src)
+            replace(src, dst)
+
+        monkeypatch.setattr(base_agent.os, "replace", recording_replace)
+        responses = [str(i) * 100_000 for i in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda response: agent._write_disk_response("key", response), responses))
+
+        assert len(set(temp_paths)) == len(responses)
+        assert agent._read_disk_response("key") in responses
+        assert [p.name for p in tmp_path.iterdir()] == ["key.txt"]
+
+    @staticmethod
+    def _parse(response):
+        try:
+            return json.loads(response)
+        except ValueError:
+            return None
+
+    def test_unparseable_response_is_not_cached(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setattr(base_agent, "RESPONSE_CACHE_DIR", str(tmp_path))
+        responses = iter(["Sorry, I can't help with that.", '{"answer": "ok"}'])
+        monkeypatch.setattr(agent, "_fetch_gemini_response", lambda *args: next(responses))
+
+        assert agent._cached_gemini_call("question", "system", self._parse) is None
+        assert not agent._response_cache
+        assert list(tmp_path.iterdir()) == []
+
+        assert agent._cached_gemini_call("question", "system", self._parse) == {"answer": "ok"}
+        assert list(agent._response_cache.values()) == ['{"answer": "ok"}']
+
+    def test_stale_disk_entry_is_dropped_and_refetched(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setattr(base_agent, "RESPONSE_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(agent, "_fetch_gemini_response", lambda *args: '{"answer": "fresh"}')
+        parse = self._parse
+
+        agent._cached_gemini_call("question", "system", parse)
+        key = next(iter(agent._response_cache))
+        agent._response_cache.clear()
+        agent._write_disk_response(key, "not json")
+
+        assert agent._cached_gemini_call("question", "system", parse) == {"answer": "fresh"}
+        assert agent._read_disk_response(key) == '{"answer": "fresh"}'
+
+    def test_streamed_json_stops_after_payload_following_prose(self, agent):
+        def chunks():
+            yield 'See note [3]: {"title": '
+            yield '"Page"} and some '
+            raise AssertionError("read past the complete payload")
+
+        assert agent._parse_streamed_json(chunks()) == {"title": "Page"}
+
+    def test_streamed_json_falls_back_to_embedded_value(self, agent):
+        assert agent._parse_streamed_json(["Answer: ", '["a", "b"]']) == ["a", "b"]
+
+    def test_stream_call_returns_first_payload_span(self, agent, monkeypatch):
+        def stream(*args):
+            yield "Here you go [draft]: "
+            yield '{"a": [1, 2]} trailing'
+            raise AssertionError("read past the complete payload")
+
+        monkeypatch.setattr(agent, "_stream_direct_gemini", stream)
+
+        assert agent._call_direct_gemini_stream("prompt", "system") == '{"a": [1, 2]}'
+
+    def test_async_call_prepares_off_the_event_loop(self, agent, monkeypatch):
+        threads = []
+
+        class FakeResponse:
+            text = "answer"
+
+        class FakeAsyncModel:
+            async def generate_content_async(self, contents, generation_config=None):
+                return FakeResponse()
+
+        def prepare(prompt, system_instruction=None, json_mode=False, generation_config=None):
+            threads.append(threading.current_thread())
+            return FakeAsyncModel(), prompt, generation_config
+
+        monkeypatch.setattr(type(agent), "direct_gemini_model", property(lambda self: object()))
+        monkeypatch.setattr(agent, "_prepare_direct_gemini", prepare)
+
+        assert asyncio.run(agent._acall_direct_gemini("question", "system")) == "answer"
+        assert threads and threads[0] is not threading.main_thread()
+
+
+LONG_PROMPT = "x" * (base_agent.CACHE_MIN_TOKENS * 3)
+
+
+class FakeTokenCount:
+    def __init__(self, total_tokens):
+        self.total_tokens = total_tokens
+
+
+class FakeModel:
+    def __init__(self, token_count=0, error=None):
+        self.token_count = token_count
+        self.error = error
+        self.count_calls = 0
+
+    def count_tokens(self, text):
+        self.count_calls += 1
+        if self.error:
+            raise self.error
+        return FakeTokenCount(self.token_count)
+
+
+class FakeCachedContent:
+    def __init__(self, expires_in):
+        self.expire_time = datetime.datetime.now(datetime.timezone.utc) + expires_in
+        self.updates = []
+
+    def update(self, ttl):
+        self.updates.append(ttl)
+
+
+class TestContextCache:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        monkeypatch.setattr(base_agent, "_CACHE", {})
+        monkeypatch.setattr(base_agent, "_UNCACHEABLE", set())
+        monkeypatch.setattr(
+            base_agent.genai.GenerativeModel, "from_cached_content",
+            classmethod(lambda cls, cached_content: ("cached-model", cached_content))
+        )
+        return QuestionGeneratorAgent()
+
+    def _use_model(self, agent, monkeypatch, model):
+        monkeypatch.setattr(type(agent), "direct_gemini_model", property(lambda self: model))
+
+    def test_short_prompt_is_marked_uncacheable_without_counting_tokens(self, agent, monkeypatch):
+        model = FakeModel(token_count=base_agent.CACHE_MIN_TOKENS)
+        self._use_model(agent, monkeypatch, model)
+
+        assert agent._get_cached_gemini_model("short system prompt") is None
+        assert agent._get_cached_gemini_model("short system prompt") is None
+        assert model.count_calls == 0
+
+        prepared_model, contents, _ = agent._prepare_direct_gemini("question", "short system prompt")
+        assert prepared_model is model
+        assert contents == "System: short system prompt\n\nUser: question"
+
+    def test_prompt_below_token_minimum_is_marked_uncacheable(self, agent, monkeypatch):
+        model = FakeModel(token_count=base_agent.CACHE_MIN_TOKENS - 1)
+        self._use_model(agent, monkeypatch, model)
+
+        assert agent._get_cached_gemini_model(LONG_PROMPT) is None
+        assert agent._get_cached_gemini_model(LONG_PROMPT) is None
+        assert model.count_calls == 1
+
+    def test_long_prompt_creates_context_cache(self, agent, monkeypatch):
+        self._use_model(agent, monkeypatch, FakeModel(token_count=base_agent.CACHE_MIN_TOKENS))
+        created = []
+
+        def create(**kwargs):
+            created.append(kwargs)
+            return FakeCachedContent(datetime.timedelta(minutes=10))
+
+        monkeypatch.setattr(base_agent.caching.CachedContent, "create", staticmethod(create))
+
+        model, cached = agent._get_cached_gemini_model(LONG_PROMPT)
+
+        assert model == "cached-model"
+        assert created[0]["system_instruction"] == LONG_PROMPT
+        assert list(base_agent._CACHE.values()) == [cached]
+
+    def test_cache_hit_refreshes_expiring_ttl(self, agent, monkeypatch):
+        model = FakeModel(token_count=base_agent.CACHE_MIN_TOKENS)
+        self._use_model(agent, monkeypatch, model)
+        fresh = FakeCachedContent(datetime.timedelta(minutes=10))
+        expiring = FakeCachedContent(datetime.timedelta(seconds=10))
+        monkeypatch.setattr(base_agent.caching.CachedContent, "create", staticmethod(lambda **kwargs: fresh))
+
+        agent._get_cached_gemini_model(LONG_PROMPT)
+        assert agent._get_cached_gemini_model(LONG_PROMPT) == ("cached-model", fresh)
+        assert fresh.updates == []
+
+        key = next(iter(base_agent._CACHE))
+        base_agent._CACHE[key] = expiring
+        assert agent._get_cached_gemini_model(LONG_PROMPT) == ("cached-model", expiring)
+        assert expiring.updates == [base_agent.CACHE_TTL]
+        assert model.count_calls == 1
+
+    def test_cache_error_falls_back_to_uncached_call(self, agent, monkeypatch):
+        model = FakeModel(error=RuntimeError("caching not available"))
+        self._use_model(agent, monkeypatch, model)
+
+        assert agent._get_cached_gemini_model(LONG_PROMPT) is None
+        assert not base_agent._CACHE
+
+        prepared_model, contents, _ = agent._prepare_direct_gemini("question", LONG_PROMPT)
+        assert prepared_model is model
+        assert contents == f"System: {LONG_PROMPT}\n\nUser: question"
+
+    def test_transient_cache_error_is_retried(self, agent, monkeypatch):
+        model = FakeModel(error=RuntimeError("503 service unavailable"))
+        self._use_model(agent, monkeypatch, model)
+        monkeypatch.setattr(
+            base_agent.caching.CachedContent, "create",
+            staticmethod(lambda **kwargs: FakeCachedContent(datetime.timedelta(minutes=10)))
+        )
+
+        assert agent._get_cached_gemini_model(LONG_PROMPT) is None
+        assert not base_agent._UNCACHEABLE
+
+        model.error = None
+        model.token_count = base_agent.CACHE_MIN_TOKENS
+        assert agent._get_cached_gemini_model(LONG_PROMPT)[0] == "cached-model"
+        assert model.count_calls == 2
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.agents.content_creator import ContentCreatorAgent
+
+
+class TestContentCreator:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        return ContentCreatorAgent()
+
+    def test_extract_json_returns_bare_json(self, agent):
+        assert agent._extract_json_from_response('  [{"question": "Q"}]\n') == '[{"question": "Q"}]'
+
+    def test_extract_json_strips_code_fence(self, agent):
+        response = '```json\n{"title": "Page"}\n```'
+        assert agent._extract_json_from_response(response) == '{"title": "Page"}'
+
+    def test_extract_json_scans_when_bracketed_text_is_not_json(self, agent):
+        response = '{"title": "Page"} note {"title": "Other"}'
+        assert agent._extract_json_from_response(response) == '{"title": "Page"}'
+
+    def test_stream_skips_bracketed_prose_before_payload(self, agent, monkeypatch):
+        chunks = ["See [3] and [Note] first: ", '{"title": ', '"Page"} trailing ', "prose"]
+        monkeypatch.setattr(agent, "_stream_direct_gemini", lambda *args: iter(chunks))
+
+        assert agent._call_direct_gemini_stream("prompt", "system") == '{"title": "Page"}'
+
+    def test_extract_json_finds_array_of_objects_after_prose(self, agent):
+        response = 'Answers [1-5] below:\n[{"question": "Q", "answer": "A"}]'
+        assert agent._extract_json_from_response(response) == '[{"question": "Q", "answer": "A"}]'
+
+    def test_faq_batch_matches_string_product_index(self, agent, monkeypatch):
+        response = json.dumps([
+            {"product_index": "2", "faq_items": [{"question": "Q2", "answer": "Answer for product 2"}]},
+            {"product_index": 1, "faq_items": [{"question": "Q1", "answer": "Answer for product 1"}]}
+        ])
+        monkeypatch.setattr(agent, "_fetch_gemini_response", lambda *args: response)
+        items = [
+            {"questions": [{"question": "Q1"}], "product_data": {"name": "Serum One"}},
+            {"questions": [{"question": "Q2"}], "product_data": {"name": "Serum Two"}}
+        ]
+
+        faqs = agent.create_faq_batch(items)
+
+        assert faqs[0][0]["answer"] == "Answer for product 1"
+        assert faqs[1][0]["answer"] == "Answer for product 2"
+
+    def test_async_faq_batches_share_one_worker_pool(self, agent, monkeypatch):
+        response = json.dumps([{"product_index": 1, "faq_items": [{"question": "Q", "answer": "A"}]}])
+        monkeypatch.setattr(ContentCreatorAgent, "_fetch_gemini_response", lambda self, *args: response)
+        items = [{"questions": [{"question": "Q"}], "product_data": {"name": "Serum"}}]
+        agents = [agent] + [ContentCreatorAgent() for _ in range(3)]
+
+        asyncio.run(agents[0].acreate_faq_batch(items))
+        threads_after_first = threading.active_count()
+        for other in agents[1:]:
+            faqs = asyncio.run(other.acreate_faq_batch(items))
+            assert faqs[0][0]["answer"] == "A"
+
+        assert threading.active_count() == threads_after_first
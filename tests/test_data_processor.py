@@ -0,0 +1,24 @@
+import pytest
+
+from src.agents.data_processor import DataProcessorAgent
+
+
+class TestDataProcessor:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        return DataProcessorAgent()
+
+    def test_basic_text_parsing_keeps_first_match(self, agent):
+        text = "Product name: GlowBoost Serum\nPrice: ₹699\nProduct line: Daily Care\nPrice: ₹999"
+        result = agent._basic_text_parsing(text)
+
+        assert result["product"]["name"] == "glowboost serum"
+        assert result["product"]["price"] == "₹699"
+
+    def test_basic_text_parsing_keeps_defaults_without_matches(self, agent):
+        result = agent._basic_text_parsing("A brightening serum for oily skin")
+
+        assert result["product"]["name"] == "GlowBoost Vitamin C Serum"
+        assert result["product"]["price"] == "₹699"
@@ -0,0 +1,40 @@
+import pytest
+
+from src.core.faq import faq_items_from_answers
+
+
+class TestFAQAnswerMatching:
+
+    @pytest.fixture
+    def questions(self):
+        return [
+            {"question": f"Question {i}?", "category": f"category{i}"}
+            for i in range(5)
+        ]
+
+    def test_matches_answers_by_id(self, questions):
+        result = [{"id": i, "answer": f"Answer {i}"} for i in reversed(range(5))]
+        items = faq_items_from_answers(questions, result)
+
+        assert [item.answer for item in items] == [f"Answer {i}" for i in range(5)]
+        assert [item.category for item in items] == [f"category{i}" for i in range(5)]
+
+    def test_question_without_answer_is_skipped(self, questions):
+        result = [{"id": i, "answer": f"Answer {i}"} for i in (0, 1, 3, 4)]
+        items = faq_items_from_answers(questions, result)
+
+        assert [item.question for item in items] == ["Question 0?", "Question 1?", "Question 3?", "Question 4?"]
+        assert [item.answer for item in items] == ["Answer 0", "Answer 1", "Answer 3", "Answer 4"]
+
+    def test_string_ids_match(self, questions):
+        result = [{"id": str(i), "answer": f"Answer {i}"} for i in range(5)]
+        items = faq_items_from_answers(questions, result)
+
+        assert [item.answer for item in items] == [f"Answer {i}" for i in range(5)]
+
+    def test_position_used_without_ids(self, questions):
+        result = [{"answer": f"Answer {i}"} for i in range(3)]
+        items = faq_items_from_answers(questions, result)
+
+        assert [item.answer for item in items] == ["Answer 0", "Answer 1", "Answer 2"]
+        assert [item.question for item in items] == ["Question 0?", "Question 1?", "Question 2?"]
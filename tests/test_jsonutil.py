@@ -0,0 +1,31 @@
+import pytest
+
+from src.core import jsonutil
+
+
+class TestJsonUtil:
+
+    @pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+    def backend(self, request, monkeypatch):
+        if request.param and not jsonutil.ORJSON_AVAILABLE:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(jsonutil, "ORJSON_AVAILABLE", request.param)
+
+    def test_compact_and_indented_layouts(self, backend):
+        data = {"name": "Sérum", "tags": [1, 2]}
+
+        assert jsonutil.dumps(data) == '{"name":"Sérum","tags":[1,2]}'
+        assert jsonutil.dumps(data, indent=True) == '{\n  "name": "Sérum",\n  "tags": [\n    1,\n    2\n  ]\n}'
+        assert jsonutil.dumpb(data) == '{"name":"Sérum","tags":[1,2]}'.encode()
+
+    def test_sort_keys_and_default(self, backend):
+        class Opaque:
+            pass
+
+        text = jsonutil.dumps({"b": Opaque(), "a": 1}, sort_keys=True, default=lambda obj: "opaque")
+
+        assert text == '{"a":1,"b":"opaque"}'
+
+    def test_loads_accepts_text_and_bytes(self, backend):
+        assert jsonutil.loads('{"a": [1]}') == {"a": [1]}
+        assert jsonutil.loads(b'{"a": [1]}') == {"a": [1]}
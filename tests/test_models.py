@@ -0,0 +1,36 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.models import ProductData, FAQItem
+
+
+class TestModels:
+
+    @pytest.fixture
+    def sample_data(self):
+        return {
+            "name": "GlowBoost Vitamin C Serum",
+            "concentration": "10% Vitamin C",
+            "skin_type": ["Oily", "Combination"],
+            "key_ingredients": ["Vitamin C", "Hyaluronic Acid"],
+            "benefits": ["Brightening", "Fades dark spots"],
+            "how_to_use": "Apply 2–3 drops in the morning before sunscreen",
+            "side_effects": "Mild tingling for sensitive skin",
+            "price": "₹699"
+        }
+
+    def test_product_data_is_frozen(self, sample_data):
+        product = ProductData(**sample_data)
+
+        with pytest.raises(ValidationError):
+            product.name = "Renamed"
+
+    def test_product_data_ignores_extra_keys(self, sample_data):
+        product = ProductData(**sample_data, description="Extracted by the LLM")
+
+        assert "description" not in product.model_dump()
+
+    def test_faq_item_ignores_extra_keys(self):
+        item = FAQItem(id=2, question="Q", answer="A", category="usage")
+
+        assert item.model_dump() == {"question": "Q", "answer": "A", "category": "usage", "tags": []}
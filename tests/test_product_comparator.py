@@ -0,0 +1,140 @@
+import asyncio
+import copy
+import json
+
+import pytest
+
+from src.agents.product_comparator import ProductComparatorAgent
+
+
+class TestProductComparator:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        return ProductComparatorAgent()
+
+    @pytest.fixture
+    def sample_data(self):
+        return {
+            "name": "GlowBoost Vitamin C Serum",
+            "concentration": "10% Vitamin C",
+            "skin_type": ["Oily", "Combination"],
+            "key_ingredients": ["Vitamin C", "Hyaluronic Acid"],
+            "benefits": ["Brightening", "Fades dark spots"],
+            "how_to_use": "Apply 2–3 drops in the morning before sunscreen",
+            "side_effects": "Mild tingling for sensitive skin",
+            "price": "₹699"
+        }
+
+    def test_async_fallback_does_not_block_on_sync_fictional_call(self, agent, sample_data, monkeypatch):
+        async def failing_run(input_data):
+            return {"success": False, "output": None}
+
+        def blocking_fictional(main_product):
+            raise AssertionError("sync fictional product call from async comparison")
+
+        monkeypatch.setattr(agent, "arun_with_json_output", failing_run)
+        monkeypatch.setattr(agent, "create_fictional_product_simple", blocking_fictional)
+
+        page = asyncio.run(agent.acreate_comparison_simple(sample_data))
+
+        assert page["products"][0]["name"] == sample_data["name"]
+
+    def test_fallback_comparison_is_not_cached(self, agent, sample_data, monkeypatch):
+        calls = []
+
+        def flaky_run(input_data):
+            calls.append(input_data)
+            if len(calls) == 1:
+                raise RuntimeError("transient Gemini failure")
+            return {"success": True, "output": {"comparison_page": {"title": "From the model"}}}
+
+        monkeypatch.setattr(agent, "run_with_json_output", flaky_run)
+        fictional = {"name": "Contrast Serum"}
+
+        fallback = agent.create_comparison_simple(sample_data, fictional)
+        page = agent.create_comparison_simple(sample_data, fictional)
+        cached = agent.create_comparison_simple(sample_data, fictional)
+
+        assert fallback["title"].startswith("Comparison:")
+        assert page == {"title": "From the model"}
+        assert cached == page
+        assert len(calls) == 2
+
+    def test_mutating_cached_results_does_not_corrupt_the_cache(self, agent, sample_data, monkeypatch):
+        fictional = dict(copy.deepcopy(sample_data), name="Contrast Serum")
+
+        def run(input_data):
+            if "main_product" in input_data:
+                return {"success": True, "output": {"comparison_page": {"title": "A vs B", "products": []}}}
+            return {"success": True, "output": {"fictional_product": copy.deepcopy(fictional)}}
+
+        monkeypatch.setattr(agent, "run_with_json_output", run)
+
+        for _ in range(2):
+            product = agent.create_fictional_product_simple(sample_data)
+            page = agent.create_comparison_simple(sample_data, product)
+            product["benefits"].append("Mutated")
+            page["products"].append({"name": "Mutated"})
+
+        assert agent.create_fictional_product_simple(sample_data) == fictional
+        assert agent.create_comparison_simple(sample_data, fictional) == {"title": "A vs B", "products": []}
+
+    def test_create_many_results_are_independent_copies(self, agent, sample_data, monkeypatch):
+        async def run(input_data):
+            if "main_product" in input_data:
+                return {"success": True, "output": {"title": "A vs B", "products": []}}
+            return {"success": True, "output": dict(sample_data, name="Contrast Serum")}
+
+        monkeypatch.setattr(agent, "arun_with_json_output", run)
+
+        first, second = asyncio.run(agent.create_many([sample_data, sample_data]))
+        first["comparison_page"]["products"].append({"name": "Mutated"})
+        first["fictional_product"]["name"] = "Mutated"
+
+        assert second["comparison_page"]["products"] == []
+        assert second["fictional_product"]["name"] == "Contrast Serum"
+
+    def _run_fictional_tool(self, agent, sample_data, response, monkeypatch):
+        monkeypatch.setattr(agent, "_call_direct_gemini", lambda *args: response)
+        tool = next(t for t in agent.tools if t.name == "create_fictional_product")
+        return json.loads(tool.func(json.dumps(sample_data)))
+
+    def test_complete_fictional_product_is_cached(self, agent, sample_data, monkeypatch):
+        product = dict(sample_data, name="Contrast Serum")
+        result = self._run_fictional_tool(agent, sample_data, json.dumps(product), monkeypatch)
+
+        assert result["status"] == "success"
+        assert agent.create_fictional_product_simple(sample_data) == product
+
+    def test_incomplete_fictional_product_is_not_cached(self, agent, sample_data, monkeypatch):
+        result = self._run_fictional_tool(agent, sample_data, '{"name": "Contrast Serum"}', monkeypatch)
+
+        assert result["status"] == "success_unvalidated"
+        assert not agent._fictional_cache
+
+    def test_non_object_fictional_response_falls_back(self, agent, sample_data, monkeypatch):
+        result = self._run_fictional_tool(agent, sample_data, '["Contrast Serum"]', monkeypatch)
+
+        assert result["status"] == "fallback"
+        assert not agent._fictional_cache
+
+    def test_parse_json_response_ignores_inner_objects_of_truncated_reply(self, agent):
+        assert agent._parse_json_response('Here: {"comparison": {"a": 1}, "winner": ') is None
+
+    def test_parse_json_response_decodes_object_after_prose(self, agent):
+        response = 'Comparison below:\n{"title": "A vs B", "products": []} Hope this helps {"x": 1}'
+        assert agent._parse_json_response(response) == {"title": "A vs B", "products": []}
+
+    def test_parse_json_response_requires_expected_keys(self, agent):
+        assert agent._parse_json_response('{"title": "A vs B"}', ("title", "products")) is None
+        assert agent._parse_json_response('{"title": "A vs B", "products": []}', ("title", "products")) is not None
+
+    def test_incomplete_comparison_uses_fallback(self, agent, sample_data, monkeypatch):
+        monkeypatch.setattr(agent, "_call_direct_gemini", lambda *args: '{"comparison": {"a": 1}, "winner": ')
+        tool = next(t for t in agent.tools if t.name == "generate_product_comparison")
+
+        result = json.loads(tool.func(json.dumps({"main_product": sample_data, "fictional_product": {"name": "B"}})))
+
+        assert result["status"] == "fallback_template"
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from src.agents.question_generator import QuestionGeneratorAgent
+
+
+class TestQuestionGenerator:
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        return QuestionGeneratorAgent()
+
+    def _generate(self, agent, questions, monkeypatch):
+        monkeypatch.setattr(agent, "_call_direct_gemini", lambda *args: json.dumps(questions))
+        tool = agent.tools[0]
+        return json.loads(tool.func(json.dumps({"name": "GlowBoost Vitamin C Serum"})))["questions"]
+
+    def test_keeps_valid_questions(self, agent, monkeypatch):
+        questions = [
+            {"question": "What is it?", "category": "informational", "priority": 1},
+            {"question": "How do I use it?", "category": "Usage", "priority": "2"},
+            {"question": "Is it safe?", "category": "safety", "priority": 3.0}
+        ]
+        result = self._generate(agent, questions, monkeypatch)
+
+        assert result[:3] == [
+            {"question": "What is it?", "category": "informational", "priority": 1},
+            {"question": "How do I use it?", "category": "usage", "priority": 2},
+            {"question": "Is it safe?", "category": "safety", "priority": 3}
+        ]
+
+    def test_rejects_non_string_text_and_fractional_priority(self, agent, monkeypatch):
+        questions = [
+            {"question": {"text": "nested"}, "category": "usage", "priority": 1},
+            {"question": 42, "category": "usage", "priority": 1},
+            {"question": None, "category": "usage", "priority": 1},
+            {"question": "Fractional?", "category": "usage", "priority": 2.7},
+            {"question": "Boolean?", "category": "usage", "priority": True},
+            {"question": "Out of range?", "category": "usage", "priority": 6},
+            {"question": "Kept?", "category": "usage", "priority": 2}
+        ]
+        result = self._generate(agent, questions, monkeypatch)
+
+        assert result[0] == {"question": "Kept?", "category": "usage", "priority": 2}
+        assert "Fractional?" not in [q["question"] for q in result]
+        assert all(isinstance(q["question"], str) for q in result)
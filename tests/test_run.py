@@ -0,0 +1,20 @@
+import run
+
+
+class TestProbeCache:
+
+    def test_probe_cache_is_tied_to_api_key(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(run, "PROBE_CACHE", str(tmp_path / "probe.json"))
+
+        run._write_probe_cache("gemini-1.5-flash", "old-key")
+
+        assert run._read_probe_cache("old-key")["model"] == "gemini-1.5-flash"
+        assert run._read_probe_cache("new-key") is None
+        assert "old-key" not in (tmp_path / "probe.json").read_text()
+
+    def test_probe_cache_without_key_is_ignored(self, tmp_path, monkeypatch):
+        cache = tmp_path / "probe.json"
+        cache.write_text('{"model": "gemini-1.5-flash", "ts": %f}' % run.time.time())
+        monkeypatch.setattr(run, "PROBE_CACHE", str(cache))
+
+        assert run._read_probe_cache("any-key") is None
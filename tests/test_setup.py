@@ -0,0 +1,26 @@
+import importlib
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def setup_script():
+    spec = importlib.util.spec_from_file_location(
+        "setup_script", Path(__file__).resolve().parent.parent / "setup.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestSetupScript:
+
+    def test_verification_refreshes_import_caches(self, setup_script, monkeypatch):
+        calls = []
+        monkeypatch.setattr(importlib, "invalidate_caches", lambda: calls.append("invalidate"))
+
+        setup_script.verify_gemini_installation()
+
+        assert calls == ["invalidate"]